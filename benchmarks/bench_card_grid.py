@@ -0,0 +1,69 @@
+"""Benchmark do tempo de relayout da grade de cards ao redimensionar.
+
+Mede quanto tempo a CardGrid leva para reposicionar os cards a cada mudança
+de largura da janela, com catálogos de 1k e 10k produtos.
+
+Uso:
+    python benchmarks/bench_card_grid.py [--sizes 1000 10000] [--steps 200]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtWidgets import QApplication
+
+from ui.card_grid import CardGrid
+from ui.card_widget import ProductCard
+
+
+def fake_products(count):
+    return [
+        {'id': i, 'name': f"Produto {i}", 'price': 10.0 + i, 'link': '',
+         'purchased': 0, 'created_at': '', 'has_image': 0}
+        for i in range(count)
+    ]
+
+
+def run(app, count, steps):
+    grid = CardGrid(lambda product, saved: ProductCard(product, saved))
+    grid.resize(1200, 800)
+    grid.show()
+    grid.set_products(fake_products(count), 500.0)
+    app.processEvents()
+
+    samples = []
+    for step in range(steps):
+        width = 700 + (step * 37) % 1200
+        start = time.perf_counter()
+        grid.resize(width, 800)
+        app.processEvents()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    widgets = len(grid.bound) + len(grid.pool)
+    grid.close()
+    grid.deleteLater()
+    return statistics.median(samples), max(samples), widgets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--steps', type=int, default=200)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+
+    print(f"{'produtos':>10}{'mediana (ms)':>15}{'pior (ms)':>12}{'cards criados':>16}")
+    for count in args.sizes:
+        median, worst, widgets = run(app, count, args.steps)
+        print(f"{count:>10}{median:>15.3f}{worst:>12.3f}{widgets:>16}")
+
+
+if __name__ == "__main__":
+    main()
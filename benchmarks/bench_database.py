@@ -0,0 +1,118 @@
+"""Microbenchmark de latência por operação do Database.
+
+Compara o comportamento antigo (uma conexão nova por operação, journal
+padrão) com a conexão persistente em WAL, e ações em massa com um commit
+por item contra uma única transação via Database.batch().
+
+Uso:
+    python benchmarks/bench_database.py [--products 2000] [--repeat 200]
+"""
+import argparse
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database import Database
+
+
+class PerOperationDatabase(Database):
+    """Reproduz o comportamento antigo: abre e fecha uma conexão por operação"""
+    def connect(self):
+        previous = getattr(self, '_previous', None)
+        if previous is not None:
+            previous.close()
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        self._previous = conn
+        return conn
+
+    def close(self):
+        previous = getattr(self, '_previous', None)
+        if previous is not None:
+            previous.close()
+            self._previous = None
+
+
+def populate(db, count):
+    conn = db.connect()
+    conn.executemany(
+        'INSERT INTO products (name, price, link) VALUES (?, ?, ?)',
+        ((f"Produto {i}", 10.0 + i, f"https://example.com/{i}") for i in range(count))
+    )
+    conn.commit()
+
+
+def measure(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def run(db_class, path, products, repeat):
+    db = db_class(path)
+    populate(db, products)
+
+    results = {
+        'get_saved_amount': measure(db.get_saved_amount, repeat),
+        'toggle_purchased': measure(lambda: db.toggle_purchased(1), repeat),
+        'update_saved_amount': measure(lambda: db.update_saved_amount(100.0), repeat),
+        'get_all_products': measure(lambda: db.get_all_products(True), max(1, repeat // 10)),
+    }
+    db.close()
+    return results
+
+
+def run_bulk(path, products, items):
+    """Marca `items` produtos como comprados, item a item e em batch()"""
+    db = Database(path)
+    populate(db, products)
+    ids = range(1, items + 1)
+
+    start = time.perf_counter()
+    for product_id in ids:
+        db.toggle_purchased(product_id)
+    separate = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with db.batch():
+        for product_id in ids:
+            db.toggle_purchased(product_id)
+    batched = (time.perf_counter() - start) * 1000
+
+    db.close()
+    return separate, batched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--dir', help="Pasta onde criar os bancos (ex.: pasta do OneDrive)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        before = run(PerOperationDatabase, str(Path(tmp) / 'before.db'), args.products, args.repeat)
+        after = run(Database, str(Path(tmp) / 'after.db'), args.products, args.repeat)
+        bulk_items = min(1000, args.products)
+        separate, batched = run_bulk(str(Path(tmp) / 'bulk.db'), args.products, bulk_items)
+
+    print(f"{'operação':<22}{'antes (ms)':>12}{'depois (ms)':>13}{'ganho':>9}")
+    for name in before:
+        speedup = before[name] / after[name] if after[name] else float('inf')
+        print(f"{name:<22}{before[name]:>12.3f}{after[name]:>13.3f}{speedup:>8.1f}x")
+
+    print(f"\n{bulk_items} produtos marcados como comprados:")
+    print(f"  um commit por item:   {separate:>9.1f} ms")
+    print(f"  uma transação batch(): {batched:>8.1f} ms ({separate / batched:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Benchmark da importação de imagens grandes: tempo e pico de memória por imagem.
+
+Compara o caminho antigo (decodificar a foto inteira, converter para RGB e
+só então reduzir) com encode_image, que decodifica o JPEG já reduzido
+(draft) e converte as cores depois de reduzir.
+
+Cada medição roda num processo novo, para o pico de memória (ru_maxrss)
+ser só daquela imagem. Sem --corpus, gera fotos sintéticas grandes numa
+pasta temporária.
+
+Uso:
+    python benchmarks/bench_image_ingest.py [--corpus pasta_com_fotos] [--repeat 3]
+"""
+import argparse
+import io
+import statistics
+import sys
+import tempfile
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+try:
+    import resource
+except ImportError:  # Windows: sem ru_maxrss, só o tempo é medido
+    resource = None
+
+from database import encode_image
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.bmp', '.gif', '.tif', '.tiff'}
+
+# (nome, largura, altura, modo, formato) das fotos sintéticas
+SYNTHETIC_CORPUS = (
+    ('camera_24mp.jpg', 6000, 4000, 'RGB', 'JPEG'),
+    ('celular_12mp.jpg', 4000, 3000, 'RGB', 'JPEG'),
+    ('recorte_12mp.png', 4000, 3000, 'RGBA', 'PNG'),
+    ('paleta_8mp.png', 3264, 2448, 'P', 'PNG'),
+)
+
+
+def legacy_encode_image(image_path):
+    """Caminho anterior: converte a foto inteira antes de reduzir"""
+    from PIL import Image
+
+    img = Image.open(image_path)
+    img = img.convert('RGB')
+    img.thumbnail((300, 300), Image.Resampling.LANCZOS)
+
+    img_bytes = io.BytesIO()
+    img.save(img_bytes, format='JPEG', quality=85)
+    return img_bytes.getvalue()
+
+
+ENCODERS = {
+    'antigo': legacy_encode_image,
+    'draft': encode_image,
+}
+
+
+def create_corpus(folder):
+    """Gera fotos com ruído (que não comprimem a quase nada) nos tamanhos do corpus"""
+    from PIL import Image
+
+    paths = []
+    for name, width, height, mode, image_format in SYNTHETIC_CORPUS:
+        bands = [Image.effect_noise((width, height), 64) for _ in range(3)]
+        img = Image.merge('RGB', bands)
+        if mode == 'RGBA':
+            img.putalpha(Image.linear_gradient('L').resize((width, height)))
+        elif mode == 'P':
+            img = img.quantize(256)
+
+        path = folder / name
+        img.save(path, format=image_format, **({'quality': 90} if image_format == 'JPEG' else {}))
+        paths.append(path)
+    return paths
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB; macOS, em bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def measure(encoder_name, image_path, repeat):
+    """Roda num processo novo: (pico de memória acima do inicial em MB, mediana em ms)"""
+    import PIL.Image  # noqa: F401  (fora da medição, como no programa já aberto)
+
+    encoder = ENCODERS[encoder_name]
+    baseline = peak_rss_mb()
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encoder(image_path)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    peak = peak_rss_mb()
+    memory = peak - baseline if peak is not None else None
+    return memory, statistics.median(samples)
+
+
+def new_process():
+    """Executor de um processo só, novo (spawn): sem herdar a memória deste"""
+    return ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+
+
+def run_corpus(paths, repeat):
+    from PIL import Image
+
+    print(f"{'imagem':<28}{'pixels':>12}{'caminho':>9}{'pico (MB)':>12}{'mediana (ms)':>14}")
+    for path in paths:
+        with Image.open(path) as img:
+            size = f"{img.width}x{img.height}"
+
+        for encoder_name in ENCODERS:
+            # Um processo por medição: ru_maxrss nunca diminui dentro do processo
+            with new_process() as executor:
+                try:
+                    memory, elapsed = executor.submit(measure, encoder_name, str(path), repeat).result()
+                except Exception as e:
+                    print(f"{path.name:<28}{size:>12}{encoder_name:>9}  erro: {e}")
+                    continue
+            memory_text = f"{memory:.1f}" if memory is not None else "n/d"
+            print(f"{path.name:<28}{size:>12}{encoder_name:>9}{memory_text:>12}{elapsed:>14.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus', help="Pasta com fotos reais (padrão: fotos sintéticas)")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.corpus:
+        paths = sorted(path for path in Path(args.corpus).iterdir()
+                       if path.suffix.lower() in IMAGE_EXTENSIONS)
+        run_corpus(paths, args.repeat)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print("Gerando fotos sintéticas...")
+        # Em outro processo: o ru_maxrss deste passa para os processos das
+        # medições, e gerar as fotos aqui inflaria o ponto de partida delas
+        with new_process() as executor:
+            paths = executor.submit(create_corpus, Path(tmp)).result()
+        run_corpus(paths, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark da busca por nome/link (FTS5) em catálogos grandes.
+
+Mede o tempo até a primeira página de resultados, que é o que a busca
+enquanto se digita precisa mostrar.
+
+Uso:
+    python benchmarks/bench_search.py [--products 100000]
+"""
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database import Database
+
+WORDS = ["notebook", "cadeira", "monitor", "teclado", "mouse", "fone", "mesa",
+         "câmera", "tênis", "mochila", "relógio", "livro", "headset", "celular"]
+BRANDS = ["samsung", "lenovo", "logitech", "dell", "sony", "apple", "xiaomi", "nike"]
+
+
+def populate(db, count):
+    rng = random.Random(42)
+    conn = db.connect()
+    conn.executemany(
+        'INSERT INTO products (name, price, link) VALUES (?, ?, ?)',
+        ((f"{rng.choice(WORDS).title()} {rng.choice(BRANDS).title()} {i}",
+          rng.uniform(10, 5000),
+          f"https://loja.example.com/{rng.choice(BRANDS)}/{i}") for i in range(count))
+    )
+    conn.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    queries = ["n", "note", "notebook sam", "câm", "camera", "logitech", "zzz"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(str(Path(tmp) / 'search.db'))
+        populate(db, args.products)
+        print(f"FTS5: {'sim' if db.has_fts else 'não (LIKE)'} | {args.products} produtos")
+        print(f"{'busca':<16}{'mediana (ms)':>14}{'resultados':>12}")
+
+        for query in queries:
+            samples = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                page = db.get_products_page(True, None, 100, query)
+                samples.append((time.perf_counter() - start) * 1000)
+            print(f"{query:<16}{statistics.median(samples):>14.3f}{len(page):>12}")
+
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Benchmark dos formatos de miniatura: bytes e tempo de decodificação por card.
+
+Para cada codec que o Pillow instalado grava e cada preset de qualidade,
+gera as miniaturas de card e mede o tamanho médio, a economia em relação
+ao formato atual (JPEG normal) e o tempo para o Qt decodificá-las, que é
+o que a grade faz ao rolar.
+
+Sem --db, usa fotos sintéticas; com --db, as imagens de um banco real.
+
+Uso:
+    python benchmarks/bench_thumbnail_codecs.py [--db meta_compra.db] [--images 200]
+"""
+import argparse
+import io
+import random
+import sqlite3
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database import (DEFAULT_THUMBNAIL_ENCODING, THUMBNAIL_PRESETS, available_codecs,
+                      encode_image, encode_thumbnails)
+
+
+def synthetic_images(count):
+    """Fotos sintéticas com gradientes, formas e ruído leve, já em 300x300 como no banco"""
+    from PIL import Image, ImageDraw, ImageFilter
+
+    rng = random.Random(42)
+    images = []
+    for _ in range(count):
+        bands = [Image.linear_gradient('L').rotate(rng.randint(0, 359)).resize((1200, 900))
+                 for _ in range(3)]
+        img = Image.merge('RGB', bands)
+        draw = ImageDraw.Draw(img)
+        for _ in range(12):
+            x, y = rng.randint(0, 1100), rng.randint(0, 800)
+            size = rng.randint(40, 300)
+            color = tuple(rng.randint(0, 255) for _ in range(3))
+            draw.ellipse((x, y, x + size, y + size), fill=color)
+        img = img.filter(ImageFilter.GaussianBlur(2))
+        img = Image.blend(img, Image.effect_noise(img.size, 30).convert('RGB'), 0.08)
+
+        source = io.BytesIO()
+        img.save(source, format='JPEG', quality=92)
+        source.seek(0)
+        images.append(encode_image(source))
+    return images
+
+
+def database_images(db_path, count):
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        return [row[0] for row in conn.execute('SELECT data FROM images LIMIT ?', (count,))]
+    finally:
+        conn.close()
+
+
+def decode_ms(cards):
+    """Tempo médio (ms) do QImage.loadFromData por card; None se o Qt não abrir o formato"""
+    from PyQt6.QtGui import QImage
+
+    samples = []
+    for data in cards:
+        image = QImage()
+        start = time.perf_counter()
+        loaded = image.loadFromData(data)
+        samples.append((time.perf_counter() - start) * 1000)
+        if not loaded:
+            return None
+    return statistics.mean(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', help="Banco de onde ler as imagens (padrão: fotos sintéticas)")
+    parser.add_argument('--images', type=int, default=200)
+    args = parser.parse_args()
+
+    # O QImage só encontra os plugins de formato (WebP, AVIF) com uma aplicação criada
+    from PyQt6.QtCore import QCoreApplication
+    app = QCoreApplication(sys.argv[:1])  # noqa: F841
+
+    images = database_images(args.db, args.images) if args.db else synthetic_images(args.images)
+    if not images:
+        print("Nenhuma imagem encontrada.")
+        return
+    print(f"{len(images)} imagens | codecs disponíveis: {', '.join(available_codecs())}")
+    print(f"{'formato':<18}{'bytes/card':>12}{'economia':>10}{'gravar (ms)':>13}{'decodificar (ms)':>18}")
+
+    baseline = None
+    encodings = [f"{codec}/{preset}" for codec in available_codecs() for preset in THUMBNAIL_PRESETS]
+    encodings.remove(DEFAULT_THUMBNAIL_ENCODING)
+    for encoding in [DEFAULT_THUMBNAIL_ENCODING] + encodings:
+        start = time.perf_counter()
+        cards = [encode_thumbnails(image, encoding)['card'] for image in images]
+        encode_time = (time.perf_counter() - start) * 1000 / len(images)
+
+        size = statistics.mean(len(card) for card in cards)
+        if baseline is None:
+            baseline = size
+        decode_time = decode_ms(cards)
+        decode_text = f"{decode_time:.3f}" if decode_time is not None else "Qt não abre"
+        print(f"{encoding:<18}{size:>12.0f}{1 - size / baseline:>10.0%}"
+              f"{encode_time:>13.2f}{decode_text:>18}")
+
+
+if __name__ == "__main__":
+    main()
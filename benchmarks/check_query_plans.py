@@ -0,0 +1,90 @@
+"""Confere se as consultas de listagem continuam usando índice.
+
+Cria um banco temporário com produtos sintéticos (ou abre o banco indicado
+só para leitura, sem migrar), roda EXPLAIN QUERY PLAN nas listagens e sai
+com código 1 se alguma delas voltou a varrer a tabela ou a ordenar em memória.
+
+Uso:
+    python benchmarks/check_query_plans.py [--db caminho.db] [--products 5000]
+"""
+import argparse
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database import Database
+
+
+def populate(db, count):
+    conn = db.connect()
+    conn.executemany(
+        'INSERT INTO products (name, price, link, purchased, created_at) VALUES (?, ?, ?, ?, ?)',
+        ((f"Produto {i}", 10.0 + i, f"https://example.com/{i}", int(i % 4 == 0),
+          f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d} 12:00:00") for i in range(count))
+    )
+    conn.commit()
+    conn.execute('ANALYZE')
+
+
+def check_query_plans(conn):
+    """Retorna (consulta, plano) de cada listagem que voltou a varrer a tabela
+    ou a ordenar em memória; lista vazia significa que está tudo indexado"""
+    problems = []
+    queries = [
+        (Database.listing_query(True), ()),
+        (Database.listing_query(False), ()),
+    ]
+    for sort in Database.SORT_MODES:
+        queries.append((Database.page_query(False, sort=sort), (0, 100)))
+        queries.append((Database.page_query(True, sort=sort), (0, 0, 0, 100)))
+
+    # Filtros de valor viram intervalo no índice de preço
+    price_filters, price_params = Database.price_filters(price_range=(10, 500), affordable=True)
+    queries.append((Database.page_query(False, price_filters, 'price_asc'), (0, *price_params, 100)))
+    queries.append((Database.page_query(True, price_filters, 'price_desc'), (0, 0, 0, *price_params, 100)))
+    for query, params in queries:
+        plan = [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {query}', params)]
+        uses_index = any('COVERING INDEX' in detail for detail in plan)
+        sorts = any('TEMP B-TREE' in detail for detail in plan)
+        if not uses_index or sorts:
+            problems.append((query, plan))
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', help="Banco existente a conferir (aberto só para leitura)")
+    parser.add_argument('--products', type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db
+        if not db_path:
+            db_path = str(Path(tmp) / 'plans.db')
+            db = Database(db_path)
+            populate(db, args.products)
+            db.close()
+
+        # Somente leitura: o banco indicado não é migrado nem muda de modo de journal
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            problems = check_query_plans(conn)
+        finally:
+            conn.close()
+
+    if not problems:
+        print("OK: todas as listagens usam índice de cobertura, sem ordenação em memória.")
+        return
+
+    for query, plan in problems:
+        print(f"REGRESSÃO: {query}")
+        for detail in plan:
+            print(f"    {detail}")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
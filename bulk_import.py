@@ -0,0 +1,167 @@
+"""Importação em lote de produtos a partir de um manifesto CSV ou JSON.
+
+O manifesto lista name, price, link (opcional) e image (caminho da imagem,
+relativo ao manifesto ou absoluto). As imagens são redimensionadas em
+paralelo, em vários processos, e todos os produtos são gravados numa única
+transação. Fotos que já estão no banco (ou repetidas no manifesto) não são
+recodificadas: o produto apenas passa a referenciar a imagem existente.
+
+Uso:
+    python bulk_import.py produtos.csv [--db caminho.db] [--workers N]
+"""
+import argparse
+import csv
+import json
+import math
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from config import Config
+from database import Database, encode_image, encode_thumbnails, hash_file
+
+
+def read_manifest(manifest_path):
+    """Lê o manifesto e retorna uma lista de dicts com caminhos absolutos"""
+    manifest_path = Path(manifest_path)
+    base_dir = manifest_path.parent
+
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        if manifest_path.suffix.lower() == '.json':
+            entries = json.load(f)
+        else:
+            entries = list(csv.DictReader(f))
+
+    items = []
+    for entry in entries:
+        image = (entry.get('image') or '').strip()
+        items.append({
+            'name': (entry.get('name') or '').strip(),
+            'price': entry.get('price'),
+            'link': (entry.get('link') or '').strip(),
+            'image_path': str(base_dir / image) if image else None,
+        })
+    return items
+
+
+def prepare_image(image_path, thumbnail_encoding):
+    """Processa uma imagem num processo de trabalho: BLOB, hash e miniaturas"""
+    image_blob = encode_image(image_path)
+    return {
+        'image': image_blob,
+        'image_hash': Database.image_hash(image_blob),
+        'thumbnails': encode_thumbnails(image_blob, thumbnail_encoding),
+        'thumbnail_encoding': thumbnail_encoding,
+    }
+
+
+def bulk_import(db, items, workers=None):
+    """Importa os itens do manifesto.
+
+    Retorna (produtos importados, imagens processadas, falhas, segundos);
+    imagens processadas são as redimensionadas nesta importação.
+
+    `falhas` é uma lista de (número do item no manifesto, motivo). Itens com erro nos
+    dados são ignorados; itens cuja imagem falha são ignorados também, para
+    não gravar produtos sem a foto que o manifesto pedia.
+    """
+    start = time.perf_counter()
+    failures = []
+    products = []
+
+    valid = []
+    for line, item in enumerate(items, 1):
+        try:
+            price = float(str(item['price']).replace(',', '.'))
+        except (TypeError, ValueError):
+            failures.append((line, f"valor inválido: {item['price']!r}"))
+            continue
+        if not math.isfinite(price):
+            failures.append((line, f"valor inválido: {item['price']!r}"))
+            continue
+        if not item['name'] or price <= 0:
+            failures.append((line, "nome vazio ou valor não positivo"))
+            continue
+        valid.append((line, dict(item, price=price)))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # 1ª etapa: hash dos arquivos, para descobrir fotos já importadas
+        hashed = []
+        futures = [
+            (line, item, executor.submit(hash_file, item['image_path']) if item['image_path'] else None)
+            for line, item in valid
+        ]
+        for line, item, future in futures:
+            try:
+                hashed.append((line, item, future.result() if future else None))
+            except Exception as e:
+                failures.append((line, f"{item['image_path']}: {e}"))
+
+        known = db.get_image_hashes({source for _, _, source in hashed if source})
+
+        # 2ª etapa: redimensionar só as fotos novas, uma vez cada
+        thumbnail_encoding = db.get_thumbnail_encoding()
+        encoding = {}
+        for _, item, source in hashed:
+            if source and source not in known and source not in encoding:
+                encoding[source] = executor.submit(prepare_image, item['image_path'], thumbnail_encoding)
+
+        stored = set()
+        failed_images = set()
+        for line, item, source in hashed:
+            product = {'name': item['name'], 'price': item['price'], 'link': item['link']}
+            if source in known:
+                product['image_hash'] = known[source]
+            elif source:
+                try:
+                    image = encoding[source].result()
+                except Exception as e:
+                    failures.append((line, f"{item['image_path']}: {e}"))
+                    failed_images.add(source)
+                    continue
+                product['image_hash'] = image['image_hash']
+                if source not in stored:
+                    product.update(image, source_hash=source)
+                    stored.add(source)
+            products.append(product)
+
+    imported = db.add_products_bulk(products) if products else 0
+    # Só as fotos decodificadas agora; as reaproveitadas não contam para a vazão
+    images = len(encoding) - len(failed_images)
+    return imported, images, failures, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa produtos em lote a partir de um manifesto CSV/JSON")
+    parser.add_argument('manifest', help="Arquivo .csv ou .json com name, price, link e image")
+    parser.add_argument('--db', help="Banco de dados (padrão: o configurado no programa)")
+    parser.add_argument('--workers', type=int, default=None, help="Processos para redimensionar imagens")
+    args = parser.parse_args()
+
+    db_path = args.db
+    if not db_path:
+        db_path = Config().get_db_path()
+    if not db_path:
+        print("Nenhum banco configurado; use --db para indicar o arquivo.")
+        sys.exit(1)
+
+    items = read_manifest(args.manifest)
+    db = Database(db_path)
+    try:
+        imported, images, failures, elapsed = bulk_import(db, items, args.workers)
+    finally:
+        db.close()
+
+    rate = images / elapsed if elapsed > 0 else 0
+    print(f"{imported} de {len(items)} produtos importados em {elapsed:.2f} s "
+          f"({rate:.1f} imagens/s)")
+
+    for line, reason in failures:
+        print(f"  item {line}: {reason}")
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
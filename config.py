@@ -1,35 +1,165 @@
+import atexit
 import json
+import math
 import os
+import threading
 from pathlib import Path
 
 class Config:
+    # Esquema da configuração: chaves que faltam no arquivo (de versões
+    # anteriores) assumem estes valores
+    DEFAULTS = {
+        "db_path": None,
+        "show_purchased": True,
+        "sort_mode": "recent",
+        "affordable_only": False,
+        "price_range": [None, None],
+        "window_geometry": None,  # QMainWindow.saveGeometry() em base64
+    }
+    
+    # Tipos aceitos em cada chave do arquivo; um valor de outro tipo (arquivo
+    # editado à mão, por exemplo) é trocado pelo padrão
+    TYPES = {
+        "db_path": (str, type(None)),
+        "show_purchased": bool,
+        "sort_mode": str,
+        "affordable_only": bool,
+        "price_range": list,
+        "window_geometry": (str, type(None)),
+    }
+    
+    # Alterações em sequência (filtros, redimensionar) viram uma só gravação
+    SAVE_DELAY = 0.5  # segundos
+    
     def __init__(self):
         self.config_file = Path.home() / ".meta_compra_config.json"
+        self.lock = threading.Lock()        # protege self.config e o estado da gravação
+        self.write_lock = threading.Lock()  # uma gravação em disco por vez
+        self.save_timer = None
+        self.dirty = False
         self.config = self.load_config()
+        
+        # Alterações ainda no atraso são gravadas ao encerrar o processo
+        atexit.register(self.flush)
     
     def load_config(self):
-        if self.config_file.exists():
+        config = dict(self.DEFAULTS)
+        if not self.config_file.exists():
+            return config
+        try:
             with open(self.config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {
-            "db_path": None,
-            "show_purchased": True
-        }
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            # Arquivo corrompido: abrir com os padrões em vez de não abrir
+            print(f"Erro ao ler configurações: {e}")
+            return config
+        
+        if not isinstance(data, dict):
+            print(f"Erro ao ler configurações: esperado um objeto JSON, não {type(data).__name__}")
+            return config
+        for key, value in data.items():
+            if key in self.TYPES and not self.is_valid(key, value):
+                print(f"Configuração inválida ignorada: {key}={value!r}")
+                continue
+            config[key] = value
+        return config
+    
+    def is_valid(self, key, value):
+        if key == "price_range":
+            # bool é subclasse de int, e o JSON aceita NaN e Infinity: nenhum vale como preço
+            return (isinstance(value, list) and len(value) == 2 and
+                    all(limit is None or (isinstance(limit, (int, float)) and not isinstance(limit, bool)
+                                          and math.isfinite(limit))
+                        for limit in value))
+        return isinstance(value, self.TYPES[key])
     
     def save_config(self):
-        with open(self.config_file, 'w', encoding='utf-8') as f:
-            json.dump(self.config, f, indent=4)
+        """Agenda a gravação; chamadas dentro do atraso são agrupadas"""
+        with self.lock:
+            self.dirty = True
+            if self.save_timer is not None:
+                self.save_timer.cancel()
+            self.save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+            self.save_timer.daemon = True
+            self.save_timer.start()
+    
+    def flush(self):
+        """Grava agora, se houver alterações pendentes.
+        
+        A gravação é atômica: um arquivo temporário substitui o anterior
+        com os.replace, então uma queda no meio nunca deixa o JSON pela metade.
+        """
+        with self.write_lock:
+            with self.lock:
+                if self.save_timer is not None:
+                    self.save_timer.cancel()
+                    self.save_timer = None
+                if not self.dirty:
+                    return
+                data = json.dumps(self.config, indent=4)
+                self.dirty = False
+    
+            # O disco é acessado fora de self.lock: quem altera a configuração não espera
+            temp_file = self.config_file.with_name(self.config_file.name + ".tmp")
+            try:
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_file, self.config_file)
+            except OSError as e:
+                print(f"Erro ao salvar configurações: {e}")
+                with self.lock:
+                    self.dirty = True
+    
+    def get(self, key):
+        return self.config.get(key, self.DEFAULTS.get(key))
+    
+    def set(self, key, value):
+        with self.lock:
+            if key in self.config and self.config[key] == value:
+                return
+            self.config[key] = value
+        self.save_config()
+    
+    def get_snapshot_path(self):
+        """Arquivo do retrato da primeira tela, ao lado da configuração"""
+        return self.config_file.with_name(".meta_compra_snapshot.json")
     
     def get_db_path(self):
-        return self.config.get("db_path")
+        return self.get("db_path")
     
     def set_db_path(self, path):
-        self.config["db_path"] = str(path)
-        self.save_config()
+        self.set("db_path", str(path))
     
     def get_show_purchased(self):
-        return self.config.get("show_purchased", True)
+        return self.get("show_purchased")
     
     def set_show_purchased(self, value):
-        self.config["show_purchased"] = value
-        self.save_config()
+        self.set("show_purchased", value)
+    
+    def get_sort_mode(self):
+        return self.get("sort_mode")
+    
+    def set_sort_mode(self, mode):
+        self.set("sort_mode", mode)
+    
+    def get_affordable_only(self):
+        return self.get("affordable_only")
+    
+    def set_affordable_only(self, value):
+        self.set("affordable_only", value)
+    
+    def get_price_range(self):
+        """Faixa de valor (mínimo, máximo); None indica lado sem limite"""
+        low, high = self.get("price_range")
+        return low, high
+    
+    def set_price_range(self, low, high):
+        self.set("price_range", [low, high])
+    
+    def get_window_geometry(self):
+        return self.get("window_geometry")
+    
+    def set_window_geometry(self, geometry):
+        self.set("window_geometry", geometry)
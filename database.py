@@ -1,24 +1,285 @@
 import sqlite3
+import threading
+from contextlib import contextmanager
+import hashlib
+import math
 from datetime import datetime
-from PIL import Image
 import io
+import os
+import warnings
+
+# Pillow só é importado ao processar uma imagem: abrir o programa e listar
+# produtos não precisa dele
+
+# Tamanho máximo da imagem gravada no banco
+IMAGE_SIZE = (300, 300)
+
+# Miniaturas pré-dimensionadas geradas junto com cada imagem
+THUMBNAIL_SIZES = {
+    'card': (250, 200),
+    'dialog': (100, 100),
+}
+
+# Formatos de gravação das miniaturas: codec -> (formato do Pillow, qualidade
+# de cada preset). A imagem de 300x300 continua em JPEG: é dela que as
+# miniaturas são regeradas, e recodificá-la mudaria o hash que os produtos usam.
+THUMBNAIL_CODECS = {
+    'jpeg': ('JPEG', {'alta': 90, 'normal': 85, 'compacta': 75}),
+    'webp': ('WEBP', {'alta': 90, 'normal': 80, 'compacta': 65}),
+    'avif': ('AVIF', {'alta': 80, 'normal': 60, 'compacta': 45}),
+}
+THUMBNAIL_PRESETS = ('alta', 'normal', 'compacta')
+
+# Codificação gravada em thumbnails.encoding, no formato "codec/preset"
+DEFAULT_THUMBNAIL_ENCODING = 'jpeg/normal'
+
+# Limites de entrada: arquivos acima disso são recusados antes de decodificar,
+# para uma imagem maliciosa (ou um panorama gigante) não esgotar a memória.
+# 100 MP cobre com folga as fotos de celular e câmera (12 a 50 MP).
+MAX_IMAGE_BYTES = 64 * 1024 * 1024
+MAX_IMAGE_PIXELS = 100_000_000
+
+# Modos reduzidos antes da conversão para RGB. Os demais são convertidos
+# antes, como sempre foram: paleta e 1 bit só se reduzem sem suavização, e
+# com transparência o Pillow pré-multiplica o alfa, que seria descartado.
+REDUCIBLE_MODES = ('RGB', 'L', 'CMYK')
+
+# Margem do thumbnail(): decodifica/reduz até o dobro do destino e só então
+# aplica o LANCZOS, mantendo a qualidade do redimensionamento completo
+REDUCING_GAP = 2.0
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(image_path):
+    """SHA-256 do arquivo lido em blocos, sem carregá-lo inteiro na memória"""
+    digest = hashlib.sha256()
+    with open(image_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def open_image(image_path):
+    """Abre a imagem (caminho ou arquivo aberto) conferindo os limites de entrada.
+    
+    Só o cabeçalho é lido aqui; os pixels são decodificados depois, já
+    no tamanho reduzido.
+    """
+    from PIL import Image
+    
+    if isinstance(image_path, (str, bytes)) or hasattr(image_path, '__fspath__'):
+        file_size = os.path.getsize(image_path)
+        if file_size > MAX_IMAGE_BYTES:
+            raise ValueError(f"arquivo de imagem grande demais ({file_size // (1024 * 1024)} MB)")
+    
+    # Acima do limite o Pillow só avisa (e recusa a partir do dobro); aqui o
+    # aviso vira recusa
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', Image.DecompressionBombWarning)
+        try:
+            return Image.open(image_path)
+        except (Image.DecompressionBombWarning, Image.DecompressionBombError) as e:
+            raise ValueError(f"imagem grande demais (limite de {MAX_IMAGE_PIXELS // 1_000_000} MP)") from e
+
+
+def encode_image(image_path):
+    """Redimensiona a imagem (caminho ou arquivo aberto) para 300x300 e retorna os bytes em JPEG.
+    
+    Função de módulo (e não método) para poder rodar em outros processos.
+    """
+    from PIL import Image
+    
+    with open_image(image_path) as img:
+        # JPEG: o libjpeg decodifica direto em 1/2, 1/4 ou 1/8 da resolução,
+        # sem nunca montar a foto inteira na memória
+        img.draft('RGB', (int(IMAGE_SIZE[0] * REDUCING_GAP), int(IMAGE_SIZE[1] * REDUCING_GAP)))
+        
+        if img.mode not in REDUCIBLE_MODES:
+            img = img.convert('RGB')
+        
+        # Redimensionar mantendo aspecto, antes de converter as cores:
+        # a conversão passa a trabalhar com 300x300 e não com a foto original
+        img.thumbnail(IMAGE_SIZE, Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
+        img = img.convert('RGB')
+    
+    # Converter para bytes
+    img_bytes = io.BytesIO()
+    img.save(img_bytes, format='JPEG', quality=85)
+    return img_bytes.getvalue()
+
+
+def available_codecs():
+    """Codecs de miniatura que o Pillow instalado consegue gravar"""
+    from PIL import features
+    
+    codecs = []
+    for codec in THUMBNAIL_CODECS:
+        try:
+            if codec == 'jpeg' or features.check_module(codec):
+                codecs.append(codec)
+        except ValueError:
+            # Versões antigas do Pillow nem conhecem o módulo (AVIF)
+            pass
+    return codecs
+
+
+def thumbnail_save_options(encoding):
+    """Formato e opções do Image.save() para uma codificação "codec/preset".
+    
+    Levanta ValueError se o codec ou o preset não existir.
+    """
+    codec, _, preset = encoding.partition('/')
+    if codec not in THUMBNAIL_CODECS or preset not in THUMBNAIL_PRESETS:
+        raise ValueError(f"codificação de miniatura desconhecida: {encoding!r}")
+    image_format, qualities = THUMBNAIL_CODECS[codec]
+    return image_format, {'quality': qualities[preset]}
+
+
+def encode_thumbnails(image_blob, encoding=DEFAULT_THUMBNAIL_ENCODING):
+    """Gera as miniaturas de todos os tamanhos a partir da imagem gravada"""
+    from PIL import Image
+    
+    image_format, options = thumbnail_save_options(encoding)
+    
+    img = Image.open(io.BytesIO(image_blob))
+    img = img.convert('RGB')
+    
+    thumbnails = {}
+    for size_name, size in THUMBNAIL_SIZES.items():
+        thumb = img.copy()
+        thumb.thumbnail(size, Image.Resampling.LANCZOS)
+        
+        thumb_bytes = io.BytesIO()
+        thumb.save(thumb_bytes, format=image_format, **options)
+        thumbnails[size_name] = thumb_bytes.getvalue()
+    return thumbnails
+
 
 class Database:
-    def __init__(self, db_path):
+    # Pragmas aplicados uma única vez em cada conexão aberta
+    PRAGMAS = (
+        # Precisa vir antes do WAL: num arquivo novo, só vale antes de ele
+        # ganhar páginas. Bancos já existentes passam a incrementais no
+        # primeiro VACUUM (ver maintenance.py), que usa o modo pedido aqui.
+        "PRAGMA auto_vacuum=INCREMENTAL",
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA cache_size=-20000",      # ~20 MB de cache de páginas
+        "PRAGMA mmap_size=268435456",    # até 256 MB mapeados em memória
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA busy_timeout=5000",
+    )
+    
+    def __init__(self, db_path, deferred=False):
+        """Com `deferred`, nada é lido do disco até open(): a janela abre o
+        banco (com as migrações) na thread do banco, depois de aparecer."""
         self.db_path = db_path
-        self.conn = None
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self.image_listeners = []
+        self.has_fts = False
+        if not deferred:
+            self.open()
+    
+    def open(self):
+        """Conecta e aplica as migrações pendentes"""
         self.create_tables()
+        self.has_fts = self.ensure_search_index()
     
     def connect(self):
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row
-        return self.conn
+        """Retorna a conexão da thread atual, abrindo-a só na primeira chamada"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            for pragma in self.PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+    
+    def close(self):
+        """Fecha todas as conexões abertas (uma por thread que usou o banco)"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        
+        for i, conn in enumerate(connections):
+            try:
+                if i == 0:
+                    # Consolida o WAL no arquivo principal antes de sincronizar
+                    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                conn.close()
+            except sqlite3.Error as e:
+                print(f"Erro ao fechar banco de dados: {e}")
+    
+    def commit(self, conn):
+        """Confirma a transação, a menos que esteja dentro de batch()"""
+        if not getattr(self._local, 'batch_depth', 0):
+            conn.commit()
+    
+    @contextmanager
+    def batch(self):
+        """Agrupa as escritas do bloco numa única transação (um único fsync).
+        
+        Dentro do bloco os métodos de escrita não confirmam nada; ao sair,
+        tudo é confirmado de uma vez, ou desfeito se houver exceção. Blocos
+        aninhados fazem parte da transação mais externa. Avisos de imagem
+        alterada só são enviados depois da confirmação.
+        """
+        conn = self.connect()
+        depth = getattr(self._local, 'batch_depth', 0)
+        if depth == 0:
+            if not conn.in_transaction:
+                conn.execute('BEGIN')
+            self._local.changed_images = []
+        
+        self._local.batch_depth = depth + 1
+        try:
+            yield
+        except BaseException:
+            self._local.batch_depth = depth
+            if depth == 0:
+                conn.rollback()
+                self._local.changed_images = []
+            raise
+        
+        self._local.batch_depth = depth
+        if depth == 0:
+            conn.commit()
+            changed, self._local.changed_images = self._local.changed_images, []
+            for product_id in changed:
+                self.notify_image_changed(product_id)
     
     def create_tables(self):
+        """Aplica as migrações pendentes, registradas em PRAGMA user_version"""
         conn = self.connect()
-        cursor = conn.cursor()
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        
+        for target, migration in enumerate(self.MIGRATIONS, 1):
+            if version >= target:
+                continue
+            # Cada migração roda numa transação própria, junto com a nova versão
+            conn.execute('BEGIN')
+            try:
+                migration(self, conn.cursor())
+                conn.execute(f'PRAGMA user_version = {target}')
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
         
-        # Tabela de produtos
+        # Versões antigas do programa podem ter gravado imagens em products.image
+        # numa cópia sincronizada do banco; o índice parcial torna a checagem barata
+        self.migrate_inline_images(conn.cursor())
+        conn.commit()
+    
+    def migrate_v1_base_tables(self, cursor):
+        # Tabela de produtos (a coluna image só é usada por bancos antigos)
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS products (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -43,54 +304,521 @@ class Database:
         cursor.execute('SELECT COUNT(*) FROM settings')
         if cursor.fetchone()[0] == 0:
             cursor.execute('INSERT INTO settings (id, saved_amount) VALUES (1, 0)')
+    
+    def migrate_v2_image_hash(self, cursor):
+        # Bancos criados antes do versionamento podem já ter a coluna
+        cursor.execute('PRAGMA table_info(products)')
+        if 'image_hash' not in {row['name'] for row in cursor.fetchall()}:
+            cursor.execute('ALTER TABLE products ADD COLUMN image_hash TEXT')
+    
+    def migrate_v3_image_tables(self, cursor):
+        # Imagens endereçadas pelo conteúdo: produtos com a mesma foto
+        # compartilham uma linha; refcount conta quantos produtos a usam
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS images (
+                hash TEXT PRIMARY KEY,
+                data BLOB NOT NULL,
+                source_hash TEXT,
+                refcount INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_images_source_hash ON images (source_hash)')
         
-        conn.commit()
-        conn.close()
+        # Miniaturas de cada imagem, endereçadas pelo hash do conteúdo
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS thumbnails (
+                image_hash TEXT NOT NULL,
+                size TEXT NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (image_hash, size)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_products_image_hash ON products (image_hash)')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_products_inline_image
+            ON products (id) WHERE image IS NOT NULL
+        ''')
+        
+        self.migrate_inline_images(cursor)
+        self.create_image_triggers(cursor)
     
-    def process_image(self, image_path):
-        """Redimensiona e converte imagem para BLOB"""
+    def migrate_v4_listing_indexes(self, cursor):
+        # Índice de cobertura na ordem da listagem: a consulta lê só o índice,
+        # sem varrer a tabela nem ordenar em memória
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_products_listing
+            ON products (purchased, created_at DESC, id DESC, name, price, link, image_hash)
+        ''')
+    
+    def migrate_v5_search_index(self, cursor):
+        # Builds do SQLite sem FTS5 continuam funcionando com busca via LIKE;
+        # o índice é criado quando o banco for aberto num build com FTS5
+        # (ver ensure_search_index)
+        self.create_search_index(cursor)
+    
+    def create_search_index(self, cursor):
+        """Índice de texto sobre nome e link, mantido em sincronia por triggers.
+        Retorna False se este SQLite não tem FTS5."""
         try:
-            img = Image.open(image_path)
-            img = img.convert('RGB')
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5(
+                    name, link,
+                    content='products', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            print(f"Busca rápida indisponível (FTS5): {e}")
+            return False
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS products_fts_insert
+            AFTER INSERT ON products
+            BEGIN
+                INSERT INTO products_fts (rowid, name, link) VALUES (NEW.id, NEW.name, NEW.link);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS products_fts_delete
+            AFTER DELETE ON products
+            BEGIN
+                INSERT INTO products_fts (products_fts, rowid, name, link)
+                VALUES ('delete', OLD.id, OLD.name, OLD.link);
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS products_fts_update
+            AFTER UPDATE OF name, link ON products
+            BEGIN
+                INSERT INTO products_fts (products_fts, rowid, name, link)
+                VALUES ('delete', OLD.id, OLD.name, OLD.link);
+                INSERT INTO products_fts (rowid, name, link) VALUES (NEW.id, NEW.name, NEW.link);
+            END
+        ''')
+        cursor.execute("INSERT INTO products_fts (products_fts) VALUES ('rebuild')")
+        return True
+    
+    def migrate_v6_price_index(self, cursor):
+        # Índice de cobertura para as ordenações por valor (e progresso), que
+        # também resolve faixa de valor e "posso comprar agora" como intervalo
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_products_price
+            ON products (purchased, price, id, name, link, created_at, image_hash)
+        ''')
+    
+    def migrate_v7_product_totals(self, cursor):
+        # Totais por grupo (pendentes/comprados) mantidos por triggers, para o
+        # header ler as estatísticas sem varrer a tabela de produtos
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS product_totals (
+                purchased INTEGER PRIMARY KEY,
+                item_count INTEGER NOT NULL DEFAULT 0,
+                price_total REAL NOT NULL DEFAULT 0
+            )
+        ''')
+        cursor.execute('''
+            INSERT OR REPLACE INTO product_totals (purchased, item_count, price_total)
+            SELECT g.purchased, COUNT(p.id), COALESCE(SUM(p.price), 0)
+            FROM (SELECT 0 AS purchased UNION ALL SELECT 1) g
+            LEFT JOIN products p ON p.purchased = g.purchased
+            GROUP BY g.purchased
+        ''')
+        
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS products_totals_insert
+            AFTER INSERT ON products
+            BEGIN
+                UPDATE product_totals
+                SET item_count = item_count + 1, price_total = price_total + NEW.price
+                WHERE purchased = NEW.purchased;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS products_totals_delete
+            AFTER DELETE ON products
+            BEGIN
+                UPDATE product_totals
+                SET item_count = item_count - 1, price_total = price_total - OLD.price
+                WHERE purchased = OLD.purchased;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS products_totals_update
+            AFTER UPDATE OF price, purchased ON products
+            BEGIN
+                UPDATE product_totals
+                SET item_count = item_count - 1, price_total = price_total - OLD.price
+                WHERE purchased = OLD.purchased;
+                UPDATE product_totals
+                SET item_count = item_count + 1, price_total = price_total + NEW.price
+                WHERE purchased = NEW.purchased;
+            END
+        ''')
+        
+        # Quanto se guarda por mês, para estimar o prazo até a meta
+        cursor.execute('PRAGMA table_info(settings)')
+        if 'monthly_savings' not in {row['name'] for row in cursor.fetchall()}:
+            cursor.execute('ALTER TABLE settings ADD COLUMN monthly_savings REAL DEFAULT 0')
+    
+    def migrate_v8_thumbnail_encoding(self, cursor):
+        # Formato de cada miniatura gravada (as existentes são todas JPEG 85)
+        # e o formato escolhido para o banco, compartilhado pelas cópias
+        # sincronizadas para uma máquina não desfazer a conversão da outra
+        cursor.execute('PRAGMA table_info(thumbnails)')
+        if 'encoding' not in {row['name'] for row in cursor.fetchall()}:
+            cursor.execute(f'''
+                ALTER TABLE thumbnails
+                ADD COLUMN encoding TEXT NOT NULL DEFAULT '{DEFAULT_THUMBNAIL_ENCODING}'
+            ''')
+        
+        cursor.execute('PRAGMA table_info(settings)')
+        if 'thumbnail_encoding' not in {row['name'] for row in cursor.fetchall()}:
+            cursor.execute(f'''
+                ALTER TABLE settings
+                ADD COLUMN thumbnail_encoding TEXT DEFAULT '{DEFAULT_THUMBNAIL_ENCODING}'
+            ''')
+    
+    def migrate_v9_maintenance(self, cursor):
+        # Quando a manutenção rodou pela última vez, em qualquer cópia
+        # sincronizada: uma máquina que já compactou poupa as outras. A troca
+        # para auto_vacuum=INCREMENTAL exige um VACUUM, que não roda dentro
+        # desta transação; ela fica com a manutenção, fora da abertura.
+        cursor.execute('PRAGMA table_info(settings)')
+        if 'last_maintenance' not in {row['name'] for row in cursor.fetchall()}:
+            cursor.execute('ALTER TABLE settings ADD COLUMN last_maintenance TIMESTAMP')
+    
+    def create_image_triggers(self, cursor):
+        """Mantém images.refcount em dia e apaga imagens que ninguém usa"""
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS products_image_insert
+            AFTER INSERT ON products WHEN NEW.image_hash IS NOT NULL
+            BEGIN
+                UPDATE images SET refcount = refcount + 1 WHERE hash = NEW.image_hash;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS products_image_update
+            AFTER UPDATE OF image_hash ON products
+            WHEN OLD.image_hash IS NOT NEW.image_hash
+            BEGIN
+                UPDATE images SET refcount = refcount + 1 WHERE hash = NEW.image_hash;
+                UPDATE images SET refcount = refcount - 1 WHERE hash = OLD.image_hash;
+                DELETE FROM images WHERE hash = OLD.image_hash AND refcount <= 0;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS products_image_delete
+            AFTER DELETE ON products WHEN OLD.image_hash IS NOT NULL
+            BEGIN
+                UPDATE images SET refcount = refcount - 1 WHERE hash = OLD.image_hash;
+                DELETE FROM images WHERE hash = OLD.image_hash AND refcount <= 0;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS images_delete
+            AFTER DELETE ON images
+            BEGIN
+                DELETE FROM thumbnails WHERE image_hash = OLD.hash;
+            END
+        ''')
+    
+    def migrate_inline_images(self, cursor):
+        """Move imagens guardadas em products.image para a tabela images"""
+        cursor.execute('SELECT 1 FROM products WHERE image IS NOT NULL LIMIT 1')
+        if cursor.fetchone() is None:
+            return
+        
+        self.backfill_image_hashes(cursor)
+        cursor.execute('''
+            INSERT OR IGNORE INTO images (hash, data)
+            SELECT image_hash, image FROM products
+            WHERE image IS NOT NULL
+            GROUP BY image_hash
+        ''')
+        cursor.execute('''
+            UPDATE images SET refcount = (
+                SELECT COUNT(*) FROM products WHERE products.image_hash = images.hash
+            )
+        ''')
+        cursor.execute('UPDATE products SET image = NULL WHERE image IS NOT NULL')
+    
+    def backfill_image_hashes(self, cursor, batch_size=200):
+        """Calcula o hash das imagens já gravadas, em lotes"""
+        while True:
+            cursor.execute('''
+                SELECT id, image FROM products
+                WHERE image IS NOT NULL AND image_hash IS NULL
+                LIMIT ?
+            ''', (batch_size,))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            cursor.executemany('UPDATE products SET image_hash=? WHERE id=?',
+                               [(self.image_hash(row['image']), row['id']) for row in rows])
+    
+    @staticmethod
+    def image_hash(image_blob):
+        return hashlib.sha256(image_blob).hexdigest() if image_blob else None
+    
+    def add_image_listener(self, callback):
+        """Registra callback(product_id), chamado quando a imagem de um produto muda ou some"""
+        self.image_listeners.append(callback)
+    
+    def notify_image_changed(self, product_id):
+        if getattr(self._local, 'batch_depth', 0):
+            self._local.changed_images.append(product_id)
+            return
+        for callback in self.image_listeners:
+            callback(product_id)
+    
+    def make_thumbnails(self, image_blob, encoding=DEFAULT_THUMBNAIL_ENCODING):
+        try:
+            return encode_thumbnails(image_blob, encoding)
+        except Exception as e:
+            print(f"Erro ao gerar miniaturas: {e}")
+            return {}
+    
+    def store_thumbnails(self, cursor, image_hash, image_blob, thumbnails=None, encoding=None):
+        if encoding is None:
+            encoding = self.get_thumbnail_encoding()
+        if thumbnails is None:
+            thumbnails = self.make_thumbnails(image_blob, encoding)
+        # A imagem pode ter sido removida enquanto as miniaturas eram geradas
+        cursor.executemany('''
+            INSERT OR REPLACE INTO thumbnails (image_hash, size, data, encoding)
+            SELECT ?, ?, ?, ? WHERE EXISTS (SELECT 1 FROM images WHERE hash = ?)
+        ''', [(image_hash, size_name, data, encoding, image_hash)
+              for size_name, data in thumbnails.items()])
+        return thumbnails
+    
+    def get_thumbnail_encoding(self):
+        conn = self.connect()
+        row = conn.execute('SELECT thumbnail_encoding FROM settings WHERE id=1').fetchone()
+        return row[0] or DEFAULT_THUMBNAIL_ENCODING
+    
+    def update_thumbnail_encoding(self, encoding):
+        """Troca o formato das miniaturas novas; as já gravadas são
+        convertidas depois, por reencode_thumbnails()"""
+        thumbnail_save_options(encoding)
+        conn = self.connect()
+        conn.execute('UPDATE settings SET thumbnail_encoding=? WHERE id=1', (encoding,))
+        self.commit(conn)
+    
+    def reencode_thumbnails(self, batch_size=50, should_continue=lambda: True):
+        """Regrava, em lotes, as miniaturas que estão em outro formato.
+        
+        As miniaturas são geradas de novo a partir da imagem de 300x300 (e não
+        da miniatura antiga, para não somar perdas). Cada lote é codificado
+        fora de transação e gravado de uma vez, para a escrita não segurar o
+        banco enquanto o Pillow trabalha; como cada lote é confirmado
+        separadamente, a conversão pode ser interrompida e retomada. Se o
+        formato mudar no meio, ela recomeça com o novo.
+        
+        Retorna {'images': imagens convertidas, 'bytes_before': ..., 'bytes_after': ...}.
+        """
+        conn = self.connect()
+        cursor = conn.cursor()
+        stats = {'images': 0, 'bytes_before': 0, 'bytes_after': 0}
+        encoding = None
+        last_hash = ''
+        
+        while should_continue():
+            current = self.get_thumbnail_encoding()
+            if current != encoding:
+                encoding, last_hash = current, ''
             
-            # Redimensionar mantendo aspecto
-            img.thumbnail((300, 300), Image.Resampling.LANCZOS)
+            # Percorre pela chave primária: imagens que falharem não voltam ao lote seguinte
+            cursor.execute('''
+                SELECT t.image_hash, SUM(length(t.data)) AS old_bytes, i.data
+                FROM thumbnails t
+                JOIN images i ON i.hash = t.image_hash
+                WHERE t.image_hash > ? AND t.encoding != ? AND length(t.data) > 0
+                GROUP BY t.image_hash
+                ORDER BY t.image_hash
+                LIMIT ?
+            ''', (last_hash, encoding, batch_size))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            
+            encoded = [(row, self.make_thumbnails(row['data'], encoding)) for row in rows]
+            for row, thumbnails in encoded:
+                if thumbnails:
+                    self.store_thumbnails(cursor, row['image_hash'], row['data'], thumbnails, encoding)
+                    stats['images'] += 1
+                    stats['bytes_before'] += row['old_bytes']
+                    stats['bytes_after'] += sum(len(data) for data in thumbnails.values())
+            conn.commit()
+            last_hash = rows[-1]['image_hash']
+        
+        return stats
+    
+    def get_thumbnail_stats(self):
+        """Espaço ocupado pelas miniaturas, por codificação: {codificação: (imagens, bytes)}"""
+        conn = self.connect()
+        rows = conn.execute('''
+            SELECT encoding, COUNT(DISTINCT image_hash), SUM(length(data))
+            FROM thumbnails
+            WHERE length(data) > 0
+            GROUP BY encoding
+        ''').fetchall()
+        return {row[0]: (row[1], row[2]) for row in rows}
+    
+    def backfill_thumbnails(self, batch_size=50, should_continue=lambda: True):
+        """Gera, em lotes, as miniaturas que faltam para imagens já gravadas.
+        
+        Como em reencode_thumbnails(), cada lote é codificado fora de
+        transação e confirmado separadamente, então a migração pode ser
+        interrompida e retomada. Retorna quantas imagens foram processadas.
+        """
+        conn = self.connect()
+        cursor = conn.cursor()
+        processed = 0
+        encoding = self.get_thumbnail_encoding()
+        
+        while should_continue():
+            cursor.execute('''
+                SELECT hash, data FROM images
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM thumbnails t
+                    WHERE t.image_hash = images.hash AND t.size = 'card'
+                )
+                LIMIT ?
+            ''', (batch_size,))
+            rows = cursor.fetchall()
+            if not rows:
+                break
             
-            # Converter para bytes
-            img_bytes = io.BytesIO()
-            img.save(img_bytes, format='JPEG', quality=85)
-            return img_bytes.getvalue()
+            encoded = [(row, self.make_thumbnails(row['data'], encoding)) for row in rows]
+            for row, thumbnails in encoded:
+                if thumbnails:
+                    self.store_thumbnails(cursor, row['hash'], row['data'], thumbnails, encoding)
+                else:
+                    # Imagem ilegível: grava um marcador vazio para não tentar de novo
+                    cursor.execute('''
+                        INSERT OR REPLACE INTO thumbnails (image_hash, size, data)
+                        SELECT ?, 'card', X'' WHERE EXISTS (SELECT 1 FROM images WHERE hash = ?)
+                    ''', (row['hash'], row['hash']))
+            conn.commit()
+            processed += len(rows)
+        
+        return processed
+    
+    def process_image(self, image_path):
+        """Redimensiona e converte imagem para BLOB"""
+        try:
+            return encode_image(image_path)
         except Exception as e:
             print(f"Erro ao processar imagem: {e}")
             return None
     
+    def store_image(self, cursor, image_path):
+        """Grava a imagem (se ainda não existir) e retorna o hash dela.
+        
+        Se o mesmo arquivo já foi importado antes, nada é recodificado nem
+        gravado. O refcount é ajustado pelos triggers ao gravar o produto.
+        """
+        try:
+            source_hash = hash_file(image_path)
+        except OSError as e:
+            print(f"Erro ao processar imagem: {e}")
+            return None
+        
+        cursor.execute('SELECT hash FROM images WHERE source_hash=?', (source_hash,))
+        row = cursor.fetchone()
+        if row:
+            return row['hash']
+        
+        image_blob = self.process_image(image_path)
+        if not image_blob:
+            return None
+        
+        image_hash = self.image_hash(image_blob)
+        cursor.execute('''
+            INSERT OR IGNORE INTO images (hash, data, source_hash)
+            VALUES (?, ?, ?)
+        ''', (image_hash, image_blob, source_hash))
+        if cursor.rowcount:
+            self.store_thumbnails(cursor, image_hash, image_blob)
+        return image_hash
+    
+    def get_image_hashes(self, source_hashes):
+        """Mapeia hashes de arquivos de origem já importados para o hash da imagem"""
+        conn = self.connect()
+        cursor = conn.cursor()
+        found = {}
+        source_hashes = list(source_hashes)
+        for i in range(0, len(source_hashes), 500):
+            chunk = source_hashes[i:i + 500]
+            cursor.execute(f'''
+                SELECT source_hash, hash FROM images
+                WHERE source_hash IN ({', '.join('?' * len(chunk))})
+            ''', chunk)
+            found.update((row['source_hash'], row['hash']) for row in cursor.fetchall())
+        return found
+    
     def add_product(self, name, price, link, image_path):
         conn = self.connect()
         cursor = conn.cursor()
         
-        image_blob = self.process_image(image_path) if image_path else None
+        image_hash = self.store_image(cursor, image_path) if image_path else None
         
         cursor.execute('''
-            INSERT INTO products (name, price, link, image)
+            INSERT INTO products (name, price, link, image_hash)
             VALUES (?, ?, ?, ?)
-        ''', (name, price, link, image_blob))
+        ''', (name, price, link, image_hash))
         
         product_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        self.commit(conn)
         return product_id
     
+    def add_products_bulk(self, products):
+        """Insere vários produtos numa única transação.
+        
+        Cada item é um dict com name, price, link e, opcionalmente, image_hash.
+        Imagens novas vêm também com image (BLOB já processado), source_hash,
+        thumbnails ({tamanho: bytes}) e thumbnail_encoding; itens que
+        reaproveitam uma imagem já gravada trazem só o image_hash. Retorna a
+        quantidade inserida.
+        """
+        conn = self.connect()
+        cursor = conn.cursor()
+        
+        with self.batch():
+            new_images = [p for p in products if p.get('image')]
+            cursor.executemany('''
+                INSERT OR IGNORE INTO images (hash, data, source_hash)
+                VALUES (?, ?, ?)
+            ''', [(p['image_hash'], p['image'], p.get('source_hash')) for p in new_images])
+            
+            cursor.executemany('''
+                INSERT OR IGNORE INTO thumbnails (image_hash, size, data, encoding)
+                VALUES (?, ?, ?, ?)
+            ''', [(p['image_hash'], size_name, data,
+                   p.get('thumbnail_encoding', DEFAULT_THUMBNAIL_ENCODING))
+                  for p in new_images
+                  for size_name, data in (p.get('thumbnails') or {}).items()])
+            
+            cursor.executemany('''
+                INSERT INTO products (name, price, link, image_hash)
+                VALUES (?, ?, ?, ?)
+            ''', [(p['name'], p['price'], p.get('link'), p.get('image_hash'))
+                  for p in products])
+        
+        return len(products)
+    
     def update_product(self, product_id, name, price, link, image_path=None):
         conn = self.connect()
         cursor = conn.cursor()
         
         if image_path:
-            image_blob = self.process_image(image_path)
+            # Os triggers liberam a imagem antiga se mais nenhum produto a usar
+            image_hash = self.store_image(cursor, image_path)
             cursor.execute('''
                 UPDATE products 
-                SET name=?, price=?, link=?, image=?
+                SET name=?, price=?, link=?, image_hash=?
                 WHERE id=?
-            ''', (name, price, link, image_blob, product_id))
+            ''', (name, price, link, image_hash, product_id))
         else:
             cursor.execute('''
                 UPDATE products 
@@ -98,51 +826,360 @@ class Database:
                 WHERE id=?
             ''', (name, price, link, product_id))
         
-        conn.commit()
-        conn.close()
+        self.commit(conn)
+        
+        if image_path:
+            self.notify_image_changed(product_id)
     
     def delete_product(self, product_id):
         conn = self.connect()
         cursor = conn.cursor()
         cursor.execute('DELETE FROM products WHERE id=?', (product_id,))
-        conn.commit()
-        conn.close()
+        self.commit(conn)
+        self.notify_image_changed(product_id)
     
     def toggle_purchased(self, product_id):
+        """Inverte o estado de comprado numa única instrução.
+        
+        Retorna o novo valor, ou None se o produto não existe mais.
+        """
         conn = self.connect()
         cursor = conn.cursor()
-        cursor.execute('SELECT purchased FROM products WHERE id=?', (product_id,))
-        current = cursor.fetchone()[0]
-        new_value = 0 if current == 1 else 1
-        cursor.execute('UPDATE products SET purchased=? WHERE id=?', (new_value, product_id))
-        conn.commit()
-        conn.close()
-        return new_value
+        toggle = 'UPDATE products SET purchased = CASE purchased WHEN 1 THEN 0 ELSE 1 END WHERE id=?'
+        
+        if sqlite3.sqlite_version_info >= (3, 35, 0):
+            # fetchall consome o RETURNING até o fim antes do commit
+            rows = cursor.execute(f'{toggle} RETURNING purchased', (product_id,)).fetchall()
+        else:
+            # SQLite sem RETURNING: o UPDATE já segura o lock de escrita, então
+            # a leitura na mesma transação vê exatamente o valor gravado
+            cursor.execute(toggle, (product_id,))
+            rows = []
+            if cursor.rowcount:
+                rows = cursor.execute('SELECT purchased FROM products WHERE id=?',
+                                      (product_id,)).fetchall()
+        
+        self.commit(conn)
+        return rows[0][0] if rows else None
+    
+    def set_purchased_many(self, product_ids, purchased):
+        """Marca (ou desmarca) vários produtos como comprados numa transação"""
+        conn = self.connect()
+        with self.batch():
+            conn.executemany('UPDATE products SET purchased=? WHERE id=?',
+                             [(1 if purchased else 0, product_id) for product_id in product_ids])
+    
+    def delete_products(self, product_ids):
+        """Remove vários produtos numa transação"""
+        conn = self.connect()
+        with self.batch():
+            conn.executemany('DELETE FROM products WHERE id=?',
+                             [(product_id,) for product_id in product_ids])
+            for product_id in product_ids:
+                self.notify_image_changed(product_id)
+    
+    def reprice_products(self, product_ids, percent):
+        """Reajusta o valor de vários produtos em `percent` por cento"""
+        conn = self.connect()
+        factor = 1 + percent / 100
+        with self.batch():
+            conn.executemany('UPDATE products SET price=ROUND(price * ?, 2) WHERE id=?',
+                             [(factor, product_id) for product_id in product_ids])
+    
+    # Colunas da listagem: tudo menos o BLOB da imagem, que é buscado sob demanda
+    PRODUCT_COLUMNS = ('id, name, price, link, purchased, created_at, '
+                       'image_hash IS NOT NULL AS has_image, image_hash')
+    
+    @classmethod
+    def listing_query(cls, show_purchased=True):
+        """SQL da listagem de produtos, na ordem exibida pela interface"""
+        if show_purchased:
+            return (f'SELECT {cls.PRODUCT_COLUMNS} FROM products '
+                    'ORDER BY purchased ASC, created_at DESC, id DESC')
+        return (f'SELECT {cls.PRODUCT_COLUMNS} FROM products '
+                'WHERE purchased=0 ORDER BY created_at DESC, id DESC')
     
     def get_all_products(self, show_purchased=True):
         conn = self.connect()
         cursor = conn.cursor()
-        
-        if show_purchased:
-            cursor.execute('SELECT * FROM products ORDER BY purchased ASC, created_at DESC')
-        else:
-            cursor.execute('SELECT * FROM products WHERE purchased=0 ORDER BY created_at DESC')
-        
+        cursor.execute(self.listing_query(show_purchased))
         products = cursor.fetchall()
-        conn.close()
         return products
     
+    def get_product(self, product_id):
+        """Retorna um produto pela chave primária (ou None), sem o BLOB da imagem"""
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute(f'SELECT {self.PRODUCT_COLUMNS} FROM products WHERE id=?', (product_id,))
+        return cursor.fetchone()
+    
+    def has_search_index(self):
+        conn = self.connect()
+        row = conn.execute("SELECT 1 FROM sqlite_master WHERE name='products_fts'").fetchone()
+        return row is not None
+    
+    def ensure_search_index(self):
+        """Cria o índice de busca que faltou na migração v5 (banco migrado num
+        SQLite sem FTS5); retorna se a busca rápida está disponível"""
+        if self.has_search_index():
+            return True
+        conn = self.connect()
+        conn.execute('BEGIN')
+        try:
+            created = self.create_search_index(conn.cursor())
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return created
+    
+    # Ordenações da listagem: modo -> (coluna, direção). O desempate é sempre
+    # o id na mesma direção, o que torna a ordem total e paginável por keyset.
+    # O progresso de um item é valor guardado / preço, então do mais adiantado
+    # para o menos adiantado é a mesma ordem que preço crescente.
+    SORT_MODES = {
+        'recent': ('created_at', 'DESC'),
+        'price_asc': ('price', 'ASC'),
+        'price_desc': ('price', 'DESC'),
+        'progress': ('price', 'ASC'),
+    }
+    
+    def search_filter(self, search):
+        """Condição SQL e parâmetros para filtrar a listagem pelo texto digitado.
+        
+        Cada palavra casa por prefixo, no nome ou no link ("note sam" encontra
+        "Notebook Samsung").
+        """
+        words = search.split()
+        if self.has_fts:
+            match = ' '.join('"{}"*'.format(word.replace('"', '""')) for word in words)
+            return 'AND id IN (SELECT rowid FROM products_fts WHERE products_fts MATCH ?) ', [match]
+        
+        # % e _ digitados são texto, não curingas
+        condition = ''.join("AND (name LIKE ? ESCAPE '\\' OR link LIKE ? ESCAPE '\\') " for _ in words)
+        params = [pattern for word in words for pattern in (f'%{self.escape_like(word)}%',) * 2]
+        return condition, params
+    
+    @staticmethod
+    def escape_like(text):
+        return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    
+    def listing_filters(self, search=None, price_range=None, affordable=False):
+        """Condição SQL e parâmetros dos filtros da listagem.
+        
+        `price_range` é (mínimo, máximo), com None para o lado sem limite.
+        `affordable` deixa só o que o valor guardado já paga, comparado
+        dentro do próprio SQL.
+        """
+        condition, params = '', []
+        if search and search.strip():
+            condition, params = self.search_filter(search)
+        
+        price_condition, price_params = self.price_filters(price_range, affordable)
+        return condition + price_condition, params + price_params
+    
+    @staticmethod
+    def price_filters(price_range=None, affordable=False):
+        """Parte dos filtros que depende só do valor (ver listing_filters)"""
+        condition, params = '', []
+        low, high = price_range or (None, None)
+        if low is not None:
+            condition += 'AND price >= ? '
+            params.append(low)
+        if high is not None:
+            condition += 'AND price <= ? '
+            params.append(high)
+        if affordable:
+            condition += 'AND price <= (SELECT saved_amount FROM settings WHERE id=1) '
+        return condition, params
+    
+    @classmethod
+    def page_query(cls, continuing, conditions='', sort='recent'):
+        """SQL de uma página dentro de um grupo (pendentes ou comprados).
+        
+        Dentro do grupo a ordem é (coluna do modo, id), então a continuação
+        é uma comparação de row values que o índice resolve como intervalo,
+        sem OFFSET.
+        """
+        column, direction = cls.SORT_MODES[sort]
+        operator = '<' if direction == 'DESC' else '>'
+        keyset = f'AND ({column}, id) {operator} (?, ?) ' if continuing else ''
+        return (f'SELECT {cls.PRODUCT_COLUMNS} FROM products '
+                f'WHERE purchased=? {keyset}{conditions}'
+                f'ORDER BY {column} {direction}, id {direction} LIMIT ?')
+    
+    def get_products_page(self, show_purchased=True, after=None, limit=100, search=None,
+                          sort='recent', price_range=None, affordable=False):
+        """Retorna até `limit` produtos na ordem da listagem, depois de `after`.
+        
+        `after` é o último produto da página anterior (ou None para começar).
+        Com `search`, só entram os produtos cujo nome ou link casam com o texto;
+        `sort`, `price_range` e `affordable` são descritos em SORT_MODES e
+        listing_filters.
+        """
+        conn = self.connect()
+        cursor = conn.cursor()
+        groups = (0, 1) if show_purchased else (0,)
+        column = self.SORT_MODES[sort][0]
+        rows = []
+        
+        conditions, params = self.listing_filters(search, price_range, affordable)
+        
+        for purchased in groups:
+            if after is not None and purchased < after['purchased']:
+                continue
+            
+            remaining = limit - len(rows)
+            if after is not None and purchased == after['purchased']:
+                cursor.execute(self.page_query(True, conditions, sort),
+                               [purchased, after[column], after['id'], *params, remaining])
+            else:
+                cursor.execute(self.page_query(False, conditions, sort),
+                               [purchased, *params, remaining])
+            
+            rows.extend(cursor.fetchall())
+            if len(rows) >= limit:
+                break
+        
+        return rows
+    
+    def iter_products(self, show_purchased=True, page_size=100, search=None,
+                      sort='recent', price_range=None, affordable=False):
+        """Gera a listagem em páginas; cada página é uma consulta curta"""
+        after = None
+        while True:
+            page = self.get_products_page(show_purchased, after, page_size, search,
+                                          sort, price_range, affordable)
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            after = page[-1]
+    
+    def get_product_image(self, product_id):
+        """Retorna o BLOB da imagem de um produto (ou None)"""
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT i.data FROM products p
+            JOIN images i ON i.hash = p.image_hash
+            WHERE p.id=?
+        ''', (product_id,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+    
+    def get_thumbnail(self, product_id, size_name='card'):
+        """Retorna a miniatura pré-dimensionada de um produto (ou None).
+        
+        Se a miniatura ainda não foi gerada (banco antigo em migração), ela é
+        criada a partir da imagem gravada só para esta leitura: quem a grava
+        é backfill_thumbnails(), para a leitura não abrir transação de escrita.
+        """
+        conn = self.connect()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT p.image_hash, t.data FROM products p
+            LEFT JOIN thumbnails t ON t.image_hash = p.image_hash AND t.size = ?
+            WHERE p.id = ?
+        ''', (size_name, product_id))
+        row = cursor.fetchone()
+        if row is None or row['image_hash'] is None:
+            return None
+        if row['data'] is not None:
+            return row['data'] or None
+        
+        image_blob = self.get_product_image(product_id)
+        if not image_blob:
+            return None
+        return self.make_thumbnails(image_blob, self.get_thumbnail_encoding()).get(size_name)
+    
     def get_saved_amount(self):
         conn = self.connect()
         cursor = conn.cursor()
         cursor.execute('SELECT saved_amount FROM settings WHERE id=1')
         amount = cursor.fetchone()[0]
-        conn.close()
         return amount
     
     def update_saved_amount(self, amount):
         conn = self.connect()
         cursor = conn.cursor()
         cursor.execute('UPDATE settings SET saved_amount=? WHERE id=1', (amount,))
-        conn.commit()
-        conn.close()
+        self.commit(conn)
+    
+    def get_monthly_savings(self):
+        conn = self.connect()
+        row = conn.execute('SELECT monthly_savings FROM settings WHERE id=1').fetchone()
+        return row[0] or 0
+    
+    def update_monthly_savings(self, amount):
+        conn = self.connect()
+        conn.execute('UPDATE settings SET monthly_savings=? WHERE id=1', (amount,))
+        self.commit(conn)
+    
+    def get_last_maintenance(self):
+        """Data da última manutenção (datetime) ou None se nunca rodou"""
+        conn = self.connect()
+        row = conn.execute('SELECT last_maintenance FROM settings WHERE id=1').fetchone()
+        return datetime.fromisoformat(row[0]) if row[0] else None
+    
+    def update_last_maintenance(self, when):
+        conn = self.connect()
+        conn.execute('UPDATE settings SET last_maintenance=? WHERE id=1',
+                     (when.isoformat(sep=' ', timespec='seconds'),))
+        self.commit(conn)
+    
+    def get_goal_stats(self):
+        """Estatísticas do header a partir dos totais mantidos por triggers.
+        
+        Os totais são lidos em O(1). A contagem do que já dá para comprar
+        depende do valor guardado, então é uma contagem por intervalo no
+        índice de preço, sem tocar na tabela.
+        """
+        conn = self.connect()
+        settings = conn.execute(
+            'SELECT saved_amount, monthly_savings FROM settings WHERE id=1'
+        ).fetchone()
+        saved = settings['saved_amount'] or 0
+        monthly = settings['monthly_savings'] or 0
+        
+        pending = conn.execute(
+            'SELECT item_count, price_total FROM product_totals WHERE purchased=0'
+        ).fetchone()
+        pending_count = pending['item_count'] if pending else 0
+        # Somas incrementais de REAL acumulam resíduos de ponto flutuante
+        pending_total = round(pending['price_total'], 2) if pending else 0
+        
+        affordable = conn.execute(
+            'SELECT COUNT(*) FROM products WHERE purchased=0 AND price <= ?', (saved,)
+        ).fetchone()[0]
+        
+        remaining = max(0, pending_total - saved)
+        if remaining == 0:
+            months = 0
+        elif monthly > 0:
+            months = math.ceil(remaining / monthly)
+        else:
+            months = None  # sem valor mensal não há como estimar
+        
+        return {
+            'saved_amount': saved,
+            'monthly_savings': monthly,
+            'pending_count': pending_count,
+            'pending_total': pending_total,
+            'remaining': remaining,
+            'affordable_count': affordable,
+            'months_to_goal': months,
+        }
+    
+    # Migrações em ordem; a posição (a partir de 1) é a versão do esquema
+    MIGRATIONS = (
+        migrate_v1_base_tables,
+        migrate_v2_image_hash,
+        migrate_v3_image_tables,
+        migrate_v4_listing_indexes,
+        migrate_v5_search_index,
+        migrate_v6_price_index,
+        migrate_v7_product_totals,
+        migrate_v8_thumbnail_encoding,
+        migrate_v9_maintenance,
+    )
@@ -1,16 +1,61 @@
+import time
+
+# Marco zero do --profile-startup, antes de qualquer import pesado
+PROCESS_START = time.perf_counter()
+
 import sys
 import os
 from pathlib import Path
-from PyQt6.QtWidgets import QApplication, QFileDialog, QMessageBox
-from PyQt6.QtGui import QDesktopServices, QIcon
-from PyQt6.QtCore import Qt
 from config import Config
-from database import Database
-from ui.main_window import MainWindow
+
+# Orçamento de tempo até a janela aparecer, conferido pelo --profile-startup
+STARTUP_BUDGET_MS = 800
+
+
+class StartupProfile:
+    """Cronometra as fases da inicialização e imprime o resumo"""
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.last = PROCESS_START
+        self.phases = []  # (fase, ms da fase, ms desde o início)
+    
+    def mark(self, phase):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last) * 1000, (now - PROCESS_START) * 1000))
+        self.last = now
+    
+    def elapsed_until(self, phase):
+        return next((total for name, _, total in self.phases if name == phase), None)
+    
+    def report(self, budget_phase):
+        if not self.enabled:
+            return
+        print("Tempo de inicialização:")
+        for phase, duration, total in self.phases:
+            print(f"  {phase:<28}{duration:>9.1f} ms{total:>11.1f} ms")
+        
+        elapsed = self.elapsed_until(budget_phase)
+        if elapsed is not None:
+            status = "dentro do" if elapsed <= STARTUP_BUDGET_MS else "ACIMA DO"
+            print(f"{budget_phase}: {elapsed:.0f} ms, {status} orçamento de {STARTUP_BUDGET_MS} ms")
+    
+    def report_cache(self):
+        """Acertos do cache de pixmaps na sessão inteira; chamado ao sair"""
+        if not self.enabled:
+            return
+        from ui.pixmap_cache import pixmap_cache
+        stats = pixmap_cache.stats()
+        print(f"Cache de imagens: {stats['hits']} acertos, {stats['misses']} faltas "
+              f"({stats['hit_rate']:.0%}), {stats['evictions']} descartes, "
+              f"{stats['entries']} pixmaps em {stats['bytes'] / (1024 * 1024):.1f} MB")
 
 
 def select_db_location():
     """Permite usuário selecionar onde salvar o banco de dados"""
+    from PyQt6.QtWidgets import QFileDialog, QMessageBox
+    
     msg = QMessageBox()
     msg.setIcon(QMessageBox.Icon.Information)
     msg.setWindowTitle("Primeiro Acesso")
@@ -34,10 +79,19 @@ def select_db_location():
 
 
 def main():
-    app = QApplication(sys.argv)
+    profile = StartupProfile('--profile-startup' in sys.argv)
+    argv = [arg for arg in sys.argv if arg != '--profile-startup']
+    
+    # Imports pesados ficam aqui dentro para o --profile-startup medir cada um
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtGui import QIcon
+    profile.mark("import PyQt6")
+    
+    app = QApplication(argv)
     
     # Configurar aparência
     app.setStyle('Fusion')
+    profile.mark("QApplication")
     
     # Carregar configurações
     config = Config()
@@ -63,13 +117,13 @@ def main():
     if not db_file.parent.exists():
         db_file.parent.mkdir(parents=True, exist_ok=True)
     
-    # Inicializar banco de dados
-    try:
-        db = Database(db_path)
-    except Exception as e:
-        QMessageBox.critical(None, "Erro", 
-                           f"Erro ao abrir banco de dados:\n{str(e)}")
-        sys.exit(1)
+    profile.mark("configuração")
+    
+    # O banco só é aberto (com as migrações) na thread do banco, depois que a
+    # janela aparecer: num OneDrive lento ou travado, a moldura não espera por ele
+    from database import Database
+    db = Database(db_path, deferred=True)
+    profile.mark("import database")
     
     # Carregar estilos
     if getattr(sys, 'frozen', False):
@@ -88,12 +142,30 @@ def main():
     icon_file = base_path / "icon.ico"
     if icon_file.exists():
         app.setWindowIcon(QIcon(str(icon_file)))
+    profile.mark("estilos e ícone")
+    
+    # Só depois da QApplication pronta: a interface não pesa nos passos anteriores
+    from ui.main_window import MainWindow
+    profile.mark("import ui")
     
-    # Criar e exibir janela principal
+    # Criar e exibir janela principal; os produtos chegam após o primeiro desenho
     window = MainWindow(db, config)
+    profile.mark("MainWindow")
     window.show()
+    profile.mark("show")
+    
+    window.first_painted.connect(lambda: profile.mark("primeiro desenho"))
+    window.database_opened.connect(lambda: profile.mark("abrir banco (migrações)"))
+    window.first_listing_shown.connect(lambda: profile.mark("primeiros produtos"))
+    window.first_listing_shown.connect(lambda: profile.report("primeiro desenho"))
+    
+    exit_code = app.exec()
+    profile.report_cache()
     
-    sys.exit(app.exec())
+    # Encerrar conexões e consolidar o WAL antes de sair
+    db.close()
+    config.flush()
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
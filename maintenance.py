@@ -0,0 +1,109 @@
+"""Manutenção do banco: verificação, compactação e estatísticas do planejador.
+
+Remover produtos ou trocar imagens deixa páginas livres no arquivo, e o
+cliente de sincronização envia o arquivo inteiro a cada mudança. Com
+auto_vacuum=INCREMENTAL as páginas livres são devolvidas em passos curtos
+(PRAGMA incremental_vacuum), sem reescrever o banco todo; bancos criados
+antes passam a esse modo com um VACUUM completo, uma única vez, na primeira
+manutenção pedida pelo usuário (o VACUUM não pode ser interrompido).
+
+As funções recebem o Database e usam a conexão da thread que as chama;
+na janela, rodam na thread do banco.
+"""
+import os
+import time
+from datetime import datetime, timedelta
+
+# A manutenção automática roda no máximo uma vez por período
+MAINTENANCE_INTERVAL = timedelta(days=7)
+
+# Páginas devolvidas por passo; entre um passo e outro a tarefa pode parar
+VACUUM_STEP_PAGES = 256
+
+# Linhas lidas por índice no ANALYZE da manutenção automática
+ANALYSIS_LIMIT = 1000
+
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+def database_size(db):
+    """Espaço em disco do banco: {'file_bytes', 'wal_bytes', 'free_bytes'}.
+
+    free_bytes são as páginas livres dentro do arquivo, que a compactação
+    devolve ao sistema.
+    """
+    conn = db.connect()
+    page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+    free_pages = conn.execute('PRAGMA freelist_count').fetchone()[0]
+
+    wal_path = f"{db.db_path}-wal"
+    return {
+        'file_bytes': os.path.getsize(db.db_path),
+        'wal_bytes': os.path.getsize(wal_path) if os.path.exists(wal_path) else 0,
+        'free_bytes': free_pages * page_size,
+    }
+
+
+def total_bytes(size):
+    """Espaço total de um database_size(): arquivo principal mais o WAL"""
+    return size['file_bytes'] + size['wal_bytes']
+
+
+def is_maintenance_due(db, now=None):
+    last = db.get_last_maintenance()
+    return last is None or (now or datetime.now()) - last >= MAINTENANCE_INTERVAL
+
+
+def run_maintenance(db, full=False, should_continue=lambda: True):
+    """Verifica a integridade, compacta e atualiza as estatísticas do banco.
+
+    `full` é a manutenção pedida pelo usuário: integrity_check completo (em
+    vez do quick_check), ANALYZE sem limite e, se preciso, a conversão para
+    auto_vacuum incremental. Na automática, should_continue() é consultado
+    entre os passos da compactação para ceder a vez à interface, e bancos
+    ainda não convertidos ficam sem compactar.
+
+    Retorna {'before', 'after' (de database_size), 'problems' (mensagens da
+    verificação; vazia se ok), 'converted' (passou a auto_vacuum incremental),
+    'seconds'}.
+    """
+    start = time.perf_counter()
+    conn = db.connect()
+    report = {'before': database_size(db), 'problems': [], 'converted': False}
+
+    # Verificação primeiro: compactar um arquivo corrompido pode piorar o estrago
+    check = 'integrity_check' if full else 'quick_check'
+    messages = [row[0] for row in conn.execute(f'PRAGMA {check}')]
+    if messages != ['ok']:
+        for message in messages:
+            print(f"Erro de integridade no banco: {message}")
+        report['problems'] = messages
+        report['after'] = report['before']
+        report['seconds'] = time.perf_counter() - start
+        return report
+
+    incremental = conn.execute('PRAGMA auto_vacuum').fetchone()[0] == AUTO_VACUUM_INCREMENTAL
+    if not incremental and full:
+        # VACUUM aplica o auto_vacuum pedido em Database.PRAGMAS
+        conn.execute('VACUUM')
+        report['converted'] = True
+    elif incremental:
+        while should_continue() and conn.execute('PRAGMA freelist_count').fetchone()[0]:
+            # executescript roda o pragma até o fim; execute() liberaria uma página só
+            conn.executescript(f'PRAGMA incremental_vacuum({VACUUM_STEP_PAGES})')
+
+    if full:
+        conn.execute('PRAGMA analysis_limit=0')
+        conn.execute('ANALYZE')
+    else:
+        conn.execute(f'PRAGMA analysis_limit={ANALYSIS_LIMIT}')
+        conn.execute('PRAGMA optimize')
+    conn.commit()
+    db.update_last_maintenance(datetime.now())
+
+    # As páginas compactadas estão no WAL até o checkpoint; só então o arquivo encolhe
+    conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+    report['after'] = database_size(db)
+    report['seconds'] = time.perf_counter() - start
+    return report
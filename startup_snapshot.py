@@ -0,0 +1,77 @@
+"""Retrato da primeira tela, gravado ao sair e exibido na próxima abertura.
+
+Guarda os dados dos primeiros produtos da listagem e as miniaturas já no
+tamanho do card, para a janela aparecer preenchida antes de o banco
+responder. A listagem real chega em seguida e corrige o que tiver mudado.
+"""
+import base64
+import json
+import os
+
+SNAPSHOT_VERSION = 1
+
+
+class SnapshotRow(tuple):
+    """Produto do retrato, acessível por índice ou por nome como sqlite3.Row"""
+    def __new__(cls, values, columns):
+        row = super().__new__(cls, values)
+        row.columns = columns
+        return row
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            key = self.columns.index(key)
+        return tuple.__getitem__(self, key)
+
+    def keys(self):
+        return list(self.columns)
+
+
+def normalize_listing(listing):
+    """Filtros da listagem no formato em que voltam do JSON (tuplas viram listas)"""
+    return json.loads(json.dumps({key: value for key, value in listing.items() if key != 'search'}))
+
+
+def write_snapshot(path, db_path, listing, stats, products, thumbnails):
+    """Grava o retrato de forma atômica; `thumbnails` é {id: bytes da miniatura}"""
+    data = {
+        'version': SNAPSHOT_VERSION,
+        'db_path': str(db_path),
+        'listing': normalize_listing(listing),
+        'stats': stats,
+        'columns': list(products[0].keys()) if products else [],
+        'products': [list(product) for product in products],
+        'thumbnails': {str(product_id): base64.b64encode(data).decode('ascii')
+                       for product_id, data in thumbnails.items() if data},
+    }
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(temp_path, path)
+
+
+def read_snapshot(path, db_path, listing):
+    """Retorna (produtos, totais, miniaturas) do retrato salvo.
+
+    Retorna None se não houver retrato, se ele for de outro banco ou de
+    outra ordenação/filtro, ou se o arquivo estiver corrompido.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if (data.get('version') != SNAPSHOT_VERSION
+                or data.get('db_path') != str(db_path)
+                or data.get('listing') != normalize_listing(listing)):
+            return None
+
+        columns = tuple(data['columns'])
+        products = [SnapshotRow(values, columns) for values in data['products']]
+        thumbnails = {int(product_id): base64.b64decode(encoded)
+                      for product_id, encoded in data['thumbnails'].items()}
+        return products, data['stats'], thumbnails
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"Erro ao ler retrato da primeira tela: {e}")
+        return None
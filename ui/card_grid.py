@@ -0,0 +1,317 @@
+from PyQt6.QtWidgets import QAbstractScrollArea, QRubberBand
+from PyQt6.QtCore import Qt, pyqtSignal, QRect, QPoint, QSize
+from PyQt6.QtGui import QKeySequence
+
+
+class CardGrid(QAbstractScrollArea):
+    """Grade virtualizada de cards.
+
+    Só existem widgets para os cards visíveis; ao rolar, os cards que saem da
+    tela voltam para um pool e são reaproveitados para os que entram. O custo
+    em memória e layout depende do tamanho da janela, não do catálogo.
+
+    A seleção é guardada por id, não por card, para sobreviver à reciclagem:
+    clique seleciona, Ctrl+clique alterna, Shift+clique seleciona o intervalo
+    e arrastar a partir do espaço vazio seleciona por área.
+    """
+    CARD_WIDTH = 280
+    CARD_HEIGHT = 380
+    SPACING = 20
+    MARGIN = 20
+
+    # Emitido quando a rolagem chega perto do fim dos produtos carregados
+    more_needed = pyqtSignal()
+    # Emitido quando o conjunto de produtos selecionados muda
+    selection_changed = pyqtSignal()
+
+    def __init__(self, card_factory, parent=None):
+        super().__init__(parent)
+        self.setObjectName("cardGrid")
+        self.viewport().setObjectName("cardGridViewport")
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.verticalScrollBar().setSingleStep(40)
+
+        # Função que cria um ProductCard já com os sinais conectados
+        self.card_factory = card_factory
+
+        self.products = []
+        self.saved_amount = 0
+        self.column_count = 1  # recalculado apenas quando a largura muda
+        self.has_more = False  # há mais páginas a carregar depois de self.products
+        self.more_requested = False
+        self.bound = {}  # id do produto -> card visível
+        self.pool = []   # cards livres para reaproveitar
+
+        self.selected = set()   # ids dos produtos selecionados
+        self.anchor = None      # índice de referência do Shift+clique
+        self.rubber_band = QRubberBand(QRubberBand.Shape.Rectangle, self.viewport())
+        self.drag_origin = None # início do arrasto, em coordenadas do conteúdo
+        self.drag_base = set()  # seleção anterior ao arrasto (mantida com Ctrl)
+
+    def set_products(self, products, saved_amount, has_more=False):
+        """Troca a lista exibida; cards visíveis são atualizados no lugar"""
+        self.products = list(products)
+        self.saved_amount = saved_amount
+        self.has_more = has_more
+        self.more_requested = False
+
+        by_id = {product['id']: product for product in self.products}
+        for product_id, card in list(self.bound.items()):
+            product = by_id.get(product_id)
+            if product is None:
+                self.release(product_id)
+                continue
+            if tuple(card.product) != tuple(product):
+                card.set_product(product)
+            # O valor guardado pode ter mudado (por exemplo, desde o retrato da primeira tela)
+            if card.saved_amount != saved_amount:
+                card.update_saved_amount(saved_amount)
+
+        # Produtos que saíram da lista (filtro, remoção) deixam a seleção
+        if self.selected - by_id.keys():
+            self.set_selection(self.selected & by_id.keys())
+        self.anchor = None
+
+        self.update_scrollbar()
+        self.relayout()
+
+    def remove_products(self, product_ids):
+        """Tira produtos da lista sem consultar o banco de novo"""
+        removed = set(product_ids)
+        for product_id in removed & self.bound.keys():
+            self.release(product_id)
+
+        self.products = [product for product in self.products if product['id'] not in removed]
+        self.anchor = None
+        self.set_selection(self.selected - removed)
+        self.update_scrollbar()
+        self.relayout()
+
+    def append_products(self, products, has_more):
+        """Acrescenta a próxima página ao fim da lista"""
+        self.products.extend(products)
+        self.has_more = has_more
+        self.more_requested = False
+        self.update_scrollbar()
+        self.relayout()
+
+    def set_saved_amount(self, amount):
+        self.saved_amount = amount
+        for card in self.bound.values():
+            card.update_saved_amount(amount)
+
+    def set_selection(self, product_ids):
+        product_ids = set(product_ids)
+        if product_ids == self.selected:
+            return
+        self.selected = product_ids
+        for product_id, card in self.bound.items():
+            card.set_selected(product_id in product_ids)
+        self.selection_changed.emit()
+
+    def clear_selection(self):
+        self.anchor = None
+        self.set_selection(set())
+
+    def content_pos(self, pos):
+        """Converte um ponto do viewport para coordenadas do conteúdo"""
+        return QPoint(pos.x(), pos.y() + self.verticalScrollBar().value())
+
+    def index_at(self, pos):
+        """Índice do card sob um ponto do viewport, ou None no espaço vazio"""
+        point = self.content_pos(pos)
+        x = point.x() - self.MARGIN
+        y = point.y() - self.MARGIN
+        if x < 0 or y < 0:
+            return None
+
+        column, inside_x = divmod(x, self.CARD_WIDTH + self.SPACING)
+        row, inside_y = divmod(y, self.CARD_HEIGHT + self.SPACING)
+        if column >= self.column_count or inside_x >= self.CARD_WIDTH or inside_y >= self.CARD_HEIGHT:
+            return None
+
+        index = row * self.column_count + column
+        return index if index < len(self.products) else None
+
+    def indexes_in_rect(self, rect):
+        """Índices dos cards que cruzam um retângulo em coordenadas do conteúdo"""
+        step_x = self.CARD_WIDTH + self.SPACING
+        step_y = self.CARD_HEIGHT + self.SPACING
+        first_column = max(0, (rect.left() - self.MARGIN) // step_x)
+        last_column = min(self.column_count - 1, (rect.right() - self.MARGIN) // step_x)
+        first_row = max(0, (rect.top() - self.MARGIN) // step_y)
+        last_row = (rect.bottom() - self.MARGIN) // step_y
+
+        indexes = []
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                index = row * self.column_count + column
+                if index >= len(self.products):
+                    return indexes
+                card_rect = QRect(self.MARGIN + column * step_x, self.MARGIN + row * step_y,
+                                  self.CARD_WIDTH, self.CARD_HEIGHT)
+                if rect.intersects(card_rect):
+                    indexes.append(index)
+        return indexes
+
+    def columns_for_width(self, width):
+        usable = width - 2 * self.MARGIN + self.SPACING
+        return max(1, usable // (self.CARD_WIDTH + self.SPACING))
+
+    def height_for_width(self, width):
+        """Altura total do conteúdo para uma dada largura de viewport"""
+        rows = -(-len(self.products) // self.columns_for_width(width))
+        if rows == 0:
+            return 0
+        return 2 * self.MARGIN + rows * self.CARD_HEIGHT + (rows - 1) * self.SPACING
+
+    def first_screen_count(self):
+        """Quantos cards cabem na primeira tela, mais uma linha de folga"""
+        rows = -(-self.viewport().height() // (self.CARD_HEIGHT + self.SPACING)) + 1
+        return self.column_count * rows
+
+    def update_scrollbar(self):
+        bar = self.verticalScrollBar()
+        height = self.height_for_width(self.viewport().width())
+        bar.setPageStep(self.viewport().height())
+        bar.setRange(0, max(0, height - self.viewport().height()))
+
+    def visible_range(self):
+        """Intervalo [início, fim) dos índices que aparecem no viewport"""
+        columns = self.column_count
+        row_height = self.CARD_HEIGHT + self.SPACING
+        top = self.verticalScrollBar().value() - self.MARGIN
+        bottom = top + self.viewport().height()
+
+        first_row = max(0, top // row_height)
+        last_row = max(0, bottom // row_height)
+
+        start = first_row * columns
+        end = min(len(self.products), (last_row + 1) * columns)
+        return start, end
+
+    def relayout(self):
+        start, end = self.visible_range()
+        visible = self.products[start:end]
+        visible_ids = {product['id'] for product in visible}
+
+        # Devolver ao pool os cards que saíram da tela
+        for product_id in list(self.bound):
+            if product_id not in visible_ids:
+                self.release(product_id)
+
+        columns = self.column_count
+        offset = self.verticalScrollBar().value()
+
+        for index, product in enumerate(visible, start):
+            card = self.bound.get(product['id'])
+            if card is None:
+                card = self.acquire(product)
+
+            row, column = divmod(index, columns)
+            x = self.MARGIN + column * (self.CARD_WIDTH + self.SPACING)
+            y = self.MARGIN + row * (self.CARD_HEIGHT + self.SPACING) - offset
+            card.move(x, y)
+
+        # Pedir a próxima página quando faltarem duas linhas para o fim
+        near_end = end >= len(self.products) - 2 * columns
+        if self.has_more and near_end and not self.more_requested:
+            self.more_requested = True
+            self.more_needed.emit()
+
+    def acquire(self, product):
+        if self.pool:
+            card = self.pool.pop()
+            card.set_product(product)
+            card.update_saved_amount(self.saved_amount)
+        else:
+            card = self.card_factory(product, self.saved_amount)
+            card.setParent(self.viewport())
+
+        card.set_selected(product['id'] in self.selected)
+        card.show()
+        self.bound[product['id']] = card
+        return card
+
+    def release(self, product_id):
+        card = self.bound.pop(product_id)
+        card.hide()
+        self.pool.append(card)
+
+    def scrollContentsBy(self, dx, dy):
+        self.relayout()
+
+    def mousePressEvent(self, event):
+        # Cliques nos cards (fora dos botões) chegam aqui com a posição no viewport
+        if event.button() != Qt.MouseButton.LeftButton:
+            super().mousePressEvent(event)
+            return
+
+        pos = event.position().toPoint()
+        ctrl = bool(event.modifiers() & Qt.KeyboardModifier.ControlModifier)
+        shift = bool(event.modifiers() & Qt.KeyboardModifier.ShiftModifier)
+        index = self.index_at(pos)
+        self.setFocus()
+
+        if index is None:
+            # Espaço vazio: seleção por área
+            self.drag_origin = self.content_pos(pos)
+            self.drag_base = set(self.selected) if ctrl else set()
+            if not ctrl:
+                self.clear_selection()
+            self.rubber_band.setGeometry(QRect(pos, QSize()))
+            self.rubber_band.show()
+            return
+
+        product_id = self.products[index]['id']
+        if shift and self.anchor is not None:
+            first, last = sorted((self.anchor, index))
+            span = {product['id'] for product in self.products[first:last + 1]}
+            self.set_selection(self.selected | span if ctrl else span)
+        elif ctrl:
+            self.anchor = index
+            self.set_selection(self.selected ^ {product_id})
+        else:
+            self.anchor = index
+            self.set_selection({product_id})
+
+    def mouseMoveEvent(self, event):
+        if self.drag_origin is None:
+            super().mouseMoveEvent(event)
+            return
+
+        current = self.content_pos(event.position().toPoint())
+        area = QRect(self.drag_origin, current).normalized()
+        self.rubber_band.setGeometry(area.translated(0, -self.verticalScrollBar().value()))
+
+        covered = {self.products[index]['id'] for index in self.indexes_in_rect(area)}
+        self.set_selection(self.drag_base | covered)
+
+    def mouseReleaseEvent(self, event):
+        if self.drag_origin is not None:
+            self.drag_origin = None
+            self.rubber_band.hide()
+        super().mouseReleaseEvent(event)
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.StandardKey.SelectAll):
+            self.set_selection(product['id'] for product in self.products)
+        elif event.key() == Qt.Key.Key_Escape and self.selected:
+            self.clear_selection()
+        else:
+            super().keyPressEvent(event)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+
+        # Os cards têm tamanho fixo: redimensionar só muda colunas e posições.
+        # O primeiro card visível continua no topo após a mudança de colunas.
+        first_visible = self.visible_range()[0]
+        columns = self.columns_for_width(self.viewport().width())
+
+        self.update_scrollbar()
+        if columns != self.column_count:
+            self.column_count = columns
+            row = first_visible // columns
+            self.verticalScrollBar().setValue(row * (self.CARD_HEIGHT + self.SPACING))
+        self.relayout()
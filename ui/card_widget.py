@@ -1,20 +1,27 @@
 from PyQt6.QtWidgets import QFrame, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QProgressBar
 from PyQt6.QtCore import Qt, QSize, pyqtSignal, QPropertyAnimation, QEasingCurve
 from PyQt6.QtGui import QPixmap, QIcon
+from ui.pixmap_cache import pixmap_cache
 import io
 
 class ProductCard(QFrame):
+    IMAGE_SIZE = QSize(250, 200)
+    
     edit_clicked = pyqtSignal(int)
     remove_clicked = pyqtSignal(int)
     purchase_clicked = pyqtSignal(int)
     link_clicked = pyqtSignal(str)
     
-    def __init__(self, product, saved_amount, parent=None):
+    def __init__(self, product, saved_amount, image_loader=None, parent=None):
         super().__init__(parent)
         self.product = product
         self.saved_amount = saved_amount
         self.is_purchased = bool(product['purchased'])
         
+        # ImageLoader que decodifica a imagem em segundo plano; usado só ao desenhar
+        self.image_loader = image_loader
+        self.image_pending = bool(product['has_image']) and image_loader is not None
+        
         self.setObjectName("productCard")
         self.setFixedSize(280, 380)
         
@@ -22,9 +29,7 @@ class ProductCard(QFrame):
         self.setup_animations()
         
         if self.is_purchased:
-            self.setProperty("purchased", "true")
-            self.style().unpolish(self)
-            self.style().polish(self)
+            self.set_purchased(True)
     
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -43,15 +48,10 @@ class ProductCard(QFrame):
         self.image_label.setFixedSize(250, 200)
         self.image_label.setScaledContents(False)
         
-        if self.product['image']:
-            pixmap = QPixmap()
-            pixmap.loadFromData(self.product['image'])
-            scaled_pixmap = pixmap.scaled(250, 200, Qt.AspectRatioMode.KeepAspectRatio, 
-                                         Qt.TransformationMode.SmoothTransformation)
-            self.image_label.setPixmap(scaled_pixmap)
+        if self.image_pending:
+            self.show_placeholder()
         else:
-            self.image_label.setText("Sem Imagem")
-            self.image_label.setObjectName("noImage")
+            self.show_no_image()
         
         image_layout.addWidget(self.image_label)
         
@@ -66,16 +66,16 @@ class ProductCard(QFrame):
         layout.addWidget(image_container)
         
         # Nome
-        name_label = QLabel(self.product['name'])
-        name_label.setObjectName("productName")
-        name_label.setWordWrap(True)
-        name_label.setMaximumHeight(40)
-        layout.addWidget(name_label)
+        self.name_label = QLabel(self.product['name'])
+        self.name_label.setObjectName("productName")
+        self.name_label.setWordWrap(True)
+        self.name_label.setMaximumHeight(40)
+        layout.addWidget(self.name_label)
         
         # Valor
-        value_label = QLabel(f"R$ {self.product['price']:,.2f}")
-        value_label.setObjectName("productPrice")
-        layout.addWidget(value_label)
+        self.price_label = QLabel(f"R$ {self.product['price']:,.2f}")
+        self.price_label.setObjectName("productPrice")
+        layout.addWidget(self.price_label)
         
         # Barra de progresso
         self.progress = QProgressBar()
@@ -83,10 +83,6 @@ class ProductCard(QFrame):
         self.progress.setFixedHeight(8)
         percentage = min(100, int((self.saved_amount / self.product['price']) * 100)) if self.product['price'] > 0 else 0
         self.progress.setValue(percentage)
-        
-        if self.is_purchased:
-            self.progress.setVisible(False)
-        
         layout.addWidget(self.progress)
         
         # Botões
@@ -127,9 +123,100 @@ class ProductCard(QFrame):
         btn_layout.addLayout(action_layout)
         layout.addLayout(btn_layout)
     
+    def load_image(self):
+        """Usa o pixmap em cache ou pede a imagem ao ImageLoader"""
+        self.image_pending = False
+        
+        pixmap = pixmap_cache.get(self.product['id'], self.product['image_hash'], self.IMAGE_SIZE)
+        if pixmap is not None:
+            self.show_pixmap(pixmap)
+            return
+        
+        self.show_placeholder()
+        self.image_loader.request(self, self.product['id'], self.IMAGE_SIZE,
+                                  self.on_image_loaded)
+    
+    def on_image_loaded(self, image):
+        if image.isNull():
+            self.show_no_image()
+            return
+        
+        pixmap = QPixmap.fromImage(image)
+        pixmap_cache.put(self.product['id'], self.product['image_hash'], self.IMAGE_SIZE, pixmap)
+        self.show_pixmap(pixmap)
+    
+    def reload_image(self):
+        """Descarta a imagem atual; a nova é buscada no próximo desenho"""
+        if self.image_loader is not None:
+            self.image_loader.cancel(self)
+        
+        if self.product['has_image'] and self.image_loader is not None:
+            self.image_pending = True
+            self.show_placeholder()
+            self.update()
+        else:
+            self.image_pending = False
+            self.show_no_image()
+    
+    def show_pixmap(self, pixmap):
+        self.image_label.setObjectName("")
+        self.image_label.setPixmap(pixmap)
+        self.style().unpolish(self.image_label)
+        self.style().polish(self.image_label)
+    
+    def show_placeholder(self):
+        self.image_label.clear()
+        self.image_label.setObjectName("imageLoading")
+        self.style().unpolish(self.image_label)
+        self.style().polish(self.image_label)
+    
+    def show_no_image(self):
+        self.image_label.setObjectName("noImage")
+        self.image_label.setText("Sem Imagem")
+        self.style().unpolish(self.image_label)
+        self.style().polish(self.image_label)
+    
+    def paintEvent(self, event):
+        # A imagem só é carregada quando o card aparece na tela pela primeira vez
+        if self.image_pending:
+            self.load_image()
+        super().paintEvent(event)
+    
     def setup_animations(self):
         self.opacity_effect = None
         
+    def set_product(self, product):
+        """Atualiza o card com os dados novos do produto, sem recriá-lo"""
+        previous = self.product
+        self.product = product
+        
+        self.name_label.setText(product['name'])
+        self.price_label.setText(f"R$ {product['price']:,.2f}")
+        self.set_purchased(bool(product['purchased']))
+        self.update_saved_amount(self.saved_amount)
+        
+        # Card reaproveitado para outro produto ou imagem trocada
+        if (product['id'] != previous['id']
+                or product['image_hash'] != previous['image_hash']):
+            self.reload_image()
+    
+    def set_purchased(self, purchased):
+        self.is_purchased = purchased
+        self.check_label.setVisible(purchased)
+        self.progress.setVisible(not purchased)
+        
+        self.setProperty("purchased", "true" if purchased else "false")
+        self.style().unpolish(self)
+        self.style().polish(self)
+    
+    def set_selected(self, selected):
+        value = "true" if selected else "false"
+        if self.property("selected") == value:
+            return
+        self.setProperty("selected", value)
+        self.style().unpolish(self)
+        self.style().polish(self)
+    
     def update_saved_amount(self, new_amount):
         self.saved_amount = new_amount
         percentage = min(100, int((self.saved_amount / self.product['price']) * 100)) if self.product['price'] > 0 else 0
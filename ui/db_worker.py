@@ -0,0 +1,126 @@
+import queue
+import sqlite3
+import threading
+import time
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class DatabaseWorker(QObject):
+    """Executa as chamadas ao banco numa thread dedicada, uma por vez.
+
+    A interface envia funções com submit() e recebe o resultado por callback,
+    já na thread da interface. Como a fila é única, uma leitura enviada depois
+    de uma escrita sempre enxerga essa escrita. Banco ocupado ou travado (por
+    exemplo, pelo cliente do OneDrive) é tentado de novo com espera crescente,
+    sem travar a janela.
+    """
+    MAX_ATTEMPTS = 6
+    FIRST_RETRY_DELAY = 0.2  # segundos; dobra a cada nova tentativa
+    MAX_RETRY_DELAY = 5.0
+
+    finished = pyqtSignal(int, object)  # ticket, resultado
+    failed = pyqtSignal(int, object)    # ticket, exceção
+    pending_changed = pyqtSignal(int)   # pedidos ainda sem resposta
+    retrying = pyqtSignal(int, float)   # tentativa que falhou, espera em segundos
+    image_changed = pyqtSignal(int)     # id do produto cuja imagem mudou
+
+    def __init__(self, db, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.requests = queue.Queue()
+        self.callbacks = {}  # ticket -> (on_done, on_error)
+        self.next_ticket = 0
+        self.stopping = False
+
+        self.finished.connect(self._on_finished)
+        self.failed.connect(self._on_failed)
+
+        # Os avisos de imagem alterada partem da thread do banco; pelo sinal,
+        # quem estiver conectado os recebe na thread da interface
+        self.db.add_image_listener(self.image_changed.emit)
+
+        self.thread = threading.Thread(target=self._run, name="database-worker")
+        self.thread.start()
+
+    def submit(self, function, *args, on_done=None, on_error=None, **kwargs):
+        """Enfileira function(*args, **kwargs) para rodar na thread do banco.
+
+        on_done(resultado) ou on_error(exceção) são chamados na thread da
+        interface; sem on_error, o erro é apenas impresso.
+        """
+        if self.stopping:
+            return None
+
+        self.next_ticket += 1
+        ticket = self.next_ticket
+        self.callbacks[ticket] = (on_done, on_error)
+        self.requests.put((ticket, function, args, kwargs))
+        self.pending_changed.emit(len(self.callbacks))
+        return ticket
+
+    def has_waiting_requests(self):
+        """Há pedidos na fila (ou o encerramento começou)? Tarefas longas
+        consultam isto, na thread do banco, para ceder a vez à interface"""
+        return self.stopping or not self.requests.empty()
+
+    def shutdown(self):
+        """Conclui os pedidos já enfileirados e encerra a thread"""
+        self.stopping = True
+        self.requests.put(None)
+        self.thread.join()
+        self.callbacks.clear()
+
+    @staticmethod
+    def is_busy_error(error):
+        message = str(error).lower()
+        return 'locked' in message or 'busy' in message
+
+    def _run(self):
+        while True:
+            request = self.requests.get()
+            if request is None:
+                return
+
+            ticket, function, args, kwargs = request
+            try:
+                result = self._call(function, args, kwargs)
+            except Exception as e:
+                self.failed.emit(ticket, e)
+            else:
+                self.finished.emit(ticket, result)
+
+    def _call(self, function, args, kwargs):
+        delay = self.FIRST_RETRY_DELAY
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            try:
+                return function(*args, **kwargs)
+            except sqlite3.OperationalError as e:
+                if attempt == self.MAX_ATTEMPTS or not self.is_busy_error(e):
+                    raise
+
+                # Uma escrita interrompida não pode deixar a transação aberta,
+                # senão a nova tentativa repetiria o INSERT dentro dela
+                conn = self.db.connect()
+                if conn.in_transaction:
+                    conn.rollback()
+
+                self.retrying.emit(attempt, delay)
+                time.sleep(delay)
+                delay = min(delay * 2, self.MAX_RETRY_DELAY)
+
+    def _on_finished(self, ticket, result):
+        on_done, _ = self.callbacks.pop(ticket, (None, None))
+        self.pending_changed.emit(len(self.callbacks))
+        if on_done is not None and not self.stopping:
+            on_done(result)
+
+    def _on_failed(self, ticket, error):
+        _, on_error = self.callbacks.pop(ticket, (None, None))
+        self.pending_changed.emit(len(self.callbacks))
+        if self.stopping:
+            return
+        if on_error is not None:
+            on_error(error)
+        else:
+            print(f"Erro no banco de dados: {error}")
@@ -1,8 +1,24 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                              QLineEdit, QPushButton, QFileDialog, QMessageBox,
-                             QCheckBox, QDoubleSpinBox)
-from PyQt6.QtCore import Qt
+                             QCheckBox, QDoubleSpinBox, QComboBox)
+from PyQt6.QtCore import Qt, QSize
 from PyQt6.QtGui import QPixmap
+from ui.pixmap_cache import pixmap_cache
+from database import THUMBNAIL_PRESETS
+from maintenance import total_bytes
+
+
+def format_size(size):
+    """Tamanho em bytes no formato exibido ao usuário (ex.: 1,5 MB)"""
+    for unit in ("bytes", "KB", "MB"):
+        if size < 1024:
+            break
+        size /= 1024
+    else:
+        unit = "GB"
+    text = f"{size:.0f}" if unit == "bytes" else f"{size:.1f}"
+    return f"{text.replace('.', ',')} {unit}"
+
 
 class AddProductDialog(QDialog):
     def __init__(self, parent=None):
@@ -101,13 +117,16 @@ class AddProductDialog(QDialog):
 
 
 class EditProductDialog(QDialog):
-    def __init__(self, product, parent=None):
+    PREVIEW_SIZE = QSize(100, 100)
+    
+    def __init__(self, product, preview_data=None, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Editar Produto")
         self.setModal(True)
         self.setFixedSize(400, 450)
         
         self.product = product
+        self.preview_data = preview_data  # miniatura já lida do banco, se não estiver em cache
         self.image_path = None
         self.keep_current_image = True
         
@@ -171,15 +190,33 @@ class EditProductDialog(QDialog):
         self.price_input.setValue(self.product['price'])
         self.link_input.setText(self.product['link'] or '')
         
-        if self.product['image']:
-            pixmap = QPixmap()
-            pixmap.loadFromData(self.product['image'])
-            scaled = pixmap.scaled(100, 100, Qt.AspectRatioMode.KeepAspectRatio,
-                                  Qt.TransformationMode.SmoothTransformation)
-            self.image_label.setPixmap(scaled)
+        preview = self.load_preview()
+        if preview is not None:
+            self.image_label.setPixmap(preview)
         else:
             self.image_label.setText("Sem imagem")
     
+    def load_preview(self):
+        """Miniatura da imagem atual, do cache ou decodificada de preview_data"""
+        product_id = self.product['id']
+        image_hash = self.product['image_hash']
+        if not image_hash:
+            return None
+        
+        scaled = pixmap_cache.get(product_id, image_hash, self.PREVIEW_SIZE)
+        if scaled is None:
+            pixmap = QPixmap()
+            if not pixmap.loadFromData(self.preview_data or b''):
+                return None
+            
+            # A miniatura do banco já vem no tamanho do diálogo
+            scaled = pixmap
+            if pixmap.width() > self.PREVIEW_SIZE.width() or pixmap.height() > self.PREVIEW_SIZE.height():
+                scaled = pixmap.scaled(self.PREVIEW_SIZE, Qt.AspectRatioMode.KeepAspectRatio,
+                                      Qt.TransformationMode.SmoothTransformation)
+            pixmap_cache.put(product_id, image_hash, self.PREVIEW_SIZE, scaled)
+        return scaled
+    
     def select_image(self):
         file_path, _ = QFileDialog.getOpenFileName(
             self, "Selecionar Imagem", "",
@@ -216,13 +253,14 @@ class EditProductDialog(QDialog):
 
 
 class EditSavedAmountDialog(QDialog):
-    def __init__(self, current_amount, parent=None):
+    def __init__(self, current_amount, monthly_savings=0, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Editar Valor Guardado")
         self.setModal(True)
-        self.setFixedSize(300, 150)
+        self.setFixedSize(300, 230)
         
         self.current_amount = current_amount
+        self.monthly_savings = monthly_savings
         self.setup_ui()
     
     def setup_ui(self):
@@ -238,6 +276,16 @@ class EditSavedAmountDialog(QDialog):
         self.amount_input.setValue(self.current_amount)
         layout.addWidget(self.amount_input)
         
+        # Usado para estimar em quantos meses a meta é atingida
+        layout.addWidget(QLabel("Quanto guarda por mês (R$):"))
+        
+        self.monthly_input = QDoubleSpinBox()
+        self.monthly_input.setMaximum(9999999.99)
+        self.monthly_input.setDecimals(2)
+        self.monthly_input.setPrefix("R$ ")
+        self.monthly_input.setValue(self.monthly_savings)
+        layout.addWidget(self.monthly_input)
+        
         btn_layout = QHBoxLayout()
         
         save_btn = QPushButton("Salvar")
@@ -253,16 +301,80 @@ class EditSavedAmountDialog(QDialog):
     
     def get_amount(self):
         return self.amount_input.value()
+    
+    def get_monthly_savings(self):
+        return self.monthly_input.value()
+
+
+class RepriceDialog(QDialog):
+    """Reajuste percentual do valor dos produtos selecionados"""
+    def __init__(self, count, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Alterar Valor")
+        self.setModal(True)
+        self.setFixedSize(300, 150)
+        
+        self.count = count
+        self.setup_ui()
+    
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setSpacing(15)
+        
+        layout.addWidget(QLabel(f"Reajuste para {self.count} produto(s):"))
+        
+        self.percent_input = QDoubleSpinBox()
+        self.percent_input.setRange(-99, 1000)
+        self.percent_input.setDecimals(1)
+        self.percent_input.setSuffix(" %")
+        layout.addWidget(self.percent_input)
+        
+        btn_layout = QHBoxLayout()
+        
+        save_btn = QPushButton("Aplicar")
+        save_btn.clicked.connect(self.accept)
+        
+        cancel_btn = QPushButton("Cancelar")
+        cancel_btn.clicked.connect(self.reject)
+        
+        btn_layout.addWidget(save_btn)
+        btn_layout.addWidget(cancel_btn)
+        
+        layout.addLayout(btn_layout)
+    
+    def get_percent(self):
+        return self.percent_input.value()
 
 
 class SettingsDialog(QDialog):
-    def __init__(self, config, parent=None):
+    CODEC_LABELS = {
+        'jpeg': "JPEG (o mais compatível)",
+        'webp': "WebP (menor)",
+        'avif': "AVIF (o menor, mais lento)",
+    }
+    PRESET_LABELS = {
+        'alta': "Alta qualidade",
+        'normal': "Normal",
+        'compacta': "Compacta",
+    }
+    
+    def __init__(self, config, thumbnail_encoding, codecs, thumbnail_stats,
+                 database_size, run_maintenance, parent=None):
+        """`codecs` são os formatos que o Pillow grava e o Qt exibe nesta máquina;
+        `thumbnail_stats` vem de Database.get_thumbnail_stats() e `database_size`
+        de maintenance.database_size(). run_maintenance(on_done, on_error) roda a
+        manutenção completa e entrega o relatório a on_done, ou o erro a on_error."""
         super().__init__(parent)
         self.setWindowTitle("Configurações")
         self.setModal(True)
-        self.setFixedSize(450, 230)
+        self.setFixedSize(450, 420)
         
         self.config = config
+        self.thumbnail_encoding = thumbnail_encoding
+        self.codecs = list(codecs)
+        self.thumbnail_stats = thumbnail_stats
+        self.database_size = database_size
+        self.run_maintenance = run_maintenance
         self.setup_ui()
     
     def setup_ui(self):
@@ -300,6 +412,49 @@ class SettingsDialog(QDialog):
         
         layout.addLayout(db_layout)
         
+        # Formato das miniaturas gravadas no banco
+        layout.addWidget(QLabel("Formato das miniaturas:"))
+        
+        codec, _, preset = self.thumbnail_encoding.partition('/')
+        if codec not in self.codecs:
+            # Escolhido em outra máquina; continua na lista para não ser trocado sem querer
+            self.codecs.append(codec)
+        
+        format_layout = QHBoxLayout()
+        self.codec_combo = QComboBox()
+        for name in self.codecs:
+            self.codec_combo.addItem(self.CODEC_LABELS.get(name, name), name)
+        self.codec_combo.setCurrentIndex(self.codecs.index(codec))
+        
+        self.preset_combo = QComboBox()
+        for name in THUMBNAIL_PRESETS:
+            self.preset_combo.addItem(self.PRESET_LABELS[name], name)
+        self.preset_combo.setCurrentIndex(max(self.preset_combo.findData(preset), 0))
+        
+        format_layout.addWidget(self.codec_combo, 2)
+        format_layout.addWidget(self.preset_combo, 1)
+        layout.addLayout(format_layout)
+        
+        self.thumbnail_stats_label = QLabel(self.thumbnail_stats_text())
+        self.thumbnail_stats_label.setObjectName("settingsInfo")
+        self.thumbnail_stats_label.setWordWrap(True)
+        layout.addWidget(self.thumbnail_stats_label)
+        
+        # Manutenção: verificar, compactar e atualizar as estatísticas do banco
+        layout.addWidget(QLabel("Manutenção do Banco:"))
+        
+        maintenance_layout = QHBoxLayout()
+        self.maintenance_label = QLabel(self.database_size_text(self.database_size))
+        self.maintenance_label.setObjectName("settingsInfo")
+        self.maintenance_label.setWordWrap(True)
+        
+        self.maintenance_btn = QPushButton("Otimizar Agora")
+        self.maintenance_btn.clicked.connect(self.start_maintenance)
+        
+        maintenance_layout.addWidget(self.maintenance_label, 3)
+        maintenance_layout.addWidget(self.maintenance_btn, 1)
+        layout.addLayout(maintenance_layout)
+        
         # Botões
         btn_layout = QHBoxLayout()
         
@@ -315,6 +470,47 @@ class SettingsDialog(QDialog):
         layout.addStretch()
         layout.addLayout(btn_layout)
     
+    def thumbnail_stats_text(self):
+        images = sum(count for count, _ in self.thumbnail_stats.values())
+        total = sum(size for _, size in self.thumbnail_stats.values())
+        text = f"Miniaturas: {images} imagens, {format_size(total)}"
+        
+        waiting = sum(count for encoding, (count, _) in self.thumbnail_stats.items()
+                      if encoding != self.thumbnail_encoding)
+        if waiting:
+            text += f" ({waiting} aguardando conversão)"
+        return text
+    
+    @staticmethod
+    def database_size_text(size):
+        text = f"Tamanho: {format_size(total_bytes(size))}"
+        if size['free_bytes']:
+            text += f" ({format_size(size['free_bytes'])} livres para compactar)"
+        return text
+    
+    def start_maintenance(self):
+        self.maintenance_btn.setEnabled(False)
+        self.maintenance_label.setText("Verificando e compactando...")
+        self.run_maintenance(self.show_maintenance_report, self.show_maintenance_error)
+    
+    def show_maintenance_report(self, report):
+        before, after = total_bytes(report['before']), total_bytes(report['after'])
+        if report['problems']:
+            text = (f"Tamanho: {format_size(before)}. A verificação encontrou "
+                    f"{len(report['problems'])} problema(s); guarde uma cópia do arquivo.")
+        else:
+            text = (f"Tamanho: {format_size(before)} → {format_size(after)} "
+                    f"({format_size(max(before - after, 0))} liberados). Integridade: ok.")
+        self.maintenance_label.setText(text)
+        self.maintenance_btn.setEnabled(True)
+    
+    def show_maintenance_error(self, error):
+        self.maintenance_label.setText(f"A manutenção falhou: {error}")
+        self.maintenance_btn.setEnabled(True)
+    
+    def get_thumbnail_encoding(self):
+        return f"{self.codec_combo.currentData()}/{self.preset_combo.currentData()}"
+    
     def change_db_location(self):
         file_path, _ = QFileDialog.getSaveFileName(
             self, "Selecionar Local do Banco de Dados", 
@@ -0,0 +1,127 @@
+from functools import partial
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QThread, Qt, pyqtSignal
+from PyQt6.QtGui import QImage
+
+
+class _LoaderSignals(QObject):
+    finished = pyqtSignal(int, QImage)  # ticket, imagem decodificada
+
+
+class _DecodeJob(QRunnable):
+    """Busca o BLOB, decodifica e redimensiona numa thread do pool"""
+    def __init__(self, ticket, product_id, size, fetch, signals):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.ticket = ticket
+        self.product_id = product_id
+        self.size = size
+        self.fetch = fetch
+        self.signals = signals
+        self.cancelled = False
+
+    def run(self):
+        if self.cancelled:
+            return
+
+        image = QImage()
+        try:
+            data = self.fetch(self.product_id)
+            if data and not self.cancelled:
+                image.loadFromData(data)
+        except Exception as e:
+            print(f"Erro ao carregar imagem: {e}")
+
+        # Miniaturas já vêm no tamanho certo; só imagens maiores são reduzidas
+        too_big = image.width() > self.size.width() or image.height() > self.size.height()
+        if too_big and not self.cancelled:
+            image = image.scaled(self.size, Qt.AspectRatioMode.KeepAspectRatio,
+                                 Qt.TransformationMode.SmoothTransformation)
+
+        if not self.cancelled:
+            self.signals.finished.emit(self.ticket, image)
+
+
+class ImageLoader(QObject):
+    """Decodifica thumbnails em segundo plano.
+
+    Cada dono (normalmente um ProductCard) tem no máximo um pedido pendente:
+    um pedido novo cancela o anterior, e pedidos de widgets destruídos são
+    cancelados automaticamente. O callback roda na thread da interface.
+    """
+    def __init__(self, fetch, parent=None):
+        super().__init__(parent)
+        self.fetch = fetch
+
+        # Threads não expiram: cada uma mantém sua conexão com o banco. O pool
+        # não é filho do loader para continuar válido enquanto os cards são
+        # destruídos junto com a janela.
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max(1, min(4, QThread.idealThreadCount())))
+        self.pool.setExpiryTimeout(-1)
+
+        self.signals = _LoaderSignals()
+        self.signals.finished.connect(self._on_finished)
+
+        self.stopping = False
+        self.next_ticket = 0
+        self.jobs = {}       # ticket -> (job, chave do dono, callback)
+        self.by_owner = {}   # chave do dono -> ticket pendente
+        self.watched = set() # donos cujo sinal destroyed já está conectado
+
+    def request(self, owner, product_id, size, callback):
+        """Agenda a decodificação da imagem do produto no tamanho pedido"""
+        key = id(owner)
+        self.cancel(owner)
+
+        if key not in self.watched:
+            self.watched.add(key)
+            owner.destroyed.connect(partial(self._on_owner_destroyed, key))
+
+        self.next_ticket += 1
+        ticket = self.next_ticket
+        job = _DecodeJob(ticket, product_id, size, self.fetch, self.signals)
+        self.jobs[ticket] = (job, key, callback)
+        self.by_owner[key] = ticket
+        self.pool.start(job)
+
+    def cancel(self, owner):
+        self._cancel_key(id(owner))
+
+    def run_task(self, task):
+        """Roda uma tarefa longa no pool, atrás das decodificações pendentes.
+
+        A tarefa deve consultar `stopping` e terminar quando ele for True.
+        """
+        self.pool.start(task, -1)
+
+    def shutdown(self):
+        """Descarta pedidos pendentes e espera os que já estão rodando"""
+        self.stopping = True
+        for job, _, _ in self.jobs.values():
+            job.cancelled = True
+        self.jobs.clear()
+        self.by_owner.clear()
+        self.pool.clear()
+        self.pool.waitForDone()
+
+    def _cancel_key(self, key):
+        ticket = self.by_owner.pop(key, None)
+        if ticket is None:
+            return
+        job, _, _ = self.jobs.pop(ticket)
+        job.cancelled = True
+        self.pool.tryTake(job)
+
+    def _on_owner_destroyed(self, key, *args):
+        self.watched.discard(key)
+        if not self.stopping:
+            self._cancel_key(key)
+
+    def _on_finished(self, ticket, image):
+        entry = self.jobs.pop(ticket, None)
+        if entry is None:
+            return  # cancelado enquanto era processado
+        _, key, callback = entry
+        self.by_owner.pop(key, None)
+        callback(image)
@@ -1,45 +1,162 @@
-from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QLabel, QPushButton, QScrollArea, QMessageBox, QFrame)
-from PyQt6.QtCore import Qt, QUrl
-from PyQt6.QtGui import QDesktopServices
+import sqlite3
+import threading
+from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
+                             QLabel, QPushButton, QMessageBox, QFrame, QLineEdit,
+                             QComboBox, QCheckBox, QDoubleSpinBox)
+from PyQt6.QtCore import Qt, QUrl, QTimer, QByteArray, pyqtSignal
+from functools import partial
+from PyQt6.QtGui import QDesktopServices, QPixmap, QImageReader
 from ui.card_widget import ProductCard
-from ui.dialogs import AddProductDialog, EditProductDialog, EditSavedAmountDialog, SettingsDialog
-from database import Database
-
-
-class FlowLayout(QHBoxLayout):
-    """Layout que organiza widgets em flow horizontal com wrap"""
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setSpacing(20)
-        self.setContentsMargins(20, 20, 20, 20)
-        self._items = []
-    
-    def addWidget(self, widget):
-        self._items.append(widget)
-        super().addWidget(widget)
-    
-    def clear_layout(self):
-        while self.count():
-            item = self.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        self._items.clear()
+from ui.card_grid import CardGrid
+from ui.image_loader import ImageLoader
+from ui.pixmap_cache import pixmap_cache
+from ui.db_worker import DatabaseWorker
+from ui.dialogs import (AddProductDialog, EditProductDialog, EditSavedAmountDialog,
+                        RepriceDialog, SettingsDialog, format_size)
+from database import Database, available_codecs
+from maintenance import database_size, is_maintenance_due, run_maintenance, total_bytes
+from startup_snapshot import read_snapshot, write_snapshot
 
 
 class MainWindow(QMainWindow):
+    PAGE_SIZE = 100
+    SEARCH_DELAY_MS = 150
+    PRICE_FILTER_DELAY_MS = 400
+    PENDING_DELAY_MS = 300
+    NOTICE_MS = 8000
+    IDLE_MAINTENANCE_MS = 60000  # banco sem pedidos por 1 minuto
+    
+    # Rótulo exibido -> modo de ordenação (Database.SORT_MODES)
+    SORT_OPTIONS = (
+        ("Mais recentes", 'recent'),
+        ("Menor valor", 'price_asc'),
+        ("Maior valor", 'price_desc'),
+        ("Mais perto da meta", 'progress'),
+    )
+    
+    NO_PRODUCTS_TEXT = "Nenhum produto adicionado ainda.\nClique em 'Adicionar' para começar!"
+    NO_RESULTS_TEXT = "Nenhum produto encontrado."
+    
+    # Marcos da inicialização, usados por --profile-startup
+    first_painted = pyqtSignal()
+    database_opened = pyqtSignal()
+    first_listing_shown = pyqtSignal()
+    
+    # Resumo da conversão de miniaturas, emitido pela thread da tarefa
+    thumbnails_reencoded = pyqtSignal(object)
+    
     def __init__(self, db, config):
+        """`db` chega sem abrir (Database(..., deferred=True)): a conexão e as
+        migrações rodam como o primeiro pedido à thread do banco, depois que a
+        moldura e o retrato da última sessão já apareceram."""
         super().__init__()
         self.db = db
         self.config = config
+        self.db_ready = threading.Event()  # open() terminou, com ou sem erro
+        self.image_loader = ImageLoader(self.fetch_card_thumbnail, self)
+        
+        # Todo acesso ao banco feito pela janela passa pela thread do banco
+        self.db_worker = DatabaseWorker(self.db, self)
+        self.db_worker.image_changed.connect(pixmap_cache.invalidate)
+        
+        self.listing = None          # filtros da listagem exibida
+        self.listing_generation = 0  # identifica a consulta mais recente
+        self.goal_stats = None       # totais do header, vindos com a listagem
+        self.started = False         # produtos já pedidos após o primeiro desenho
+        self.listing_loaded = False  # a listagem real (não o retrato) já chegou
+        self.products_by_id = {}     # modelo: id -> produto carregado na grade
+        self.thumbnail_job_running = False
+        self.thumbnails_reencoded.connect(self.show_reencode_report)
+        
+        # Manutenção automática, uma vez por sessão, quando o banco fica ocioso
+        self.maintenance_checked = False
+        self.maintenance_timer = QTimer(self)
+        self.maintenance_timer.setSingleShot(True)
+        self.maintenance_timer.setInterval(self.IDLE_MAINTENANCE_MS)
+        self.maintenance_timer.timeout.connect(self.start_idle_maintenance)
+        self.db_worker.pending_changed.connect(self.postpone_maintenance)
         
         self.setWindowTitle("Meta de Compra")
         self.setMinimumSize(800, 600)
         self.resize(1200, 800)
         
+        # Tamanho e posição da última sessão (inclui estado maximizado)
+        geometry = self.config.get_window_geometry()
+        if geometry:
+            self.restoreGeometry(QByteArray.fromBase64(geometry.encode('ascii')))
+        
         self.setup_ui()
+        self.show_snapshot()
+    
+    def show_snapshot(self):
+        """Exibe o retrato gravado na última saída enquanto o banco não responde"""
+        snapshot = read_snapshot(self.config.get_snapshot_path(), self.db.db_path,
+                                 self.current_listing())
+        if snapshot is None:
+            return
+        
+        products, stats, thumbnails = snapshot
+        for product in products:
+            pixmap = QPixmap()
+            if thumbnails.get(product['id']) and pixmap.loadFromData(thumbnails[product['id']]):
+                # Os cards encontram a miniatura no cache e nem consultam o banco
+                pixmap_cache.put(product['id'], product['image_hash'], ProductCard.IMAGE_SIZE, pixmap)
+        
+        saved_amount = self.show_goal_stats(stats)
+        self.products_by_id = {product['id']: product for product in products}
+        self.no_products_label.setVisible(not products)
+        self.card_grid.setVisible(bool(products))
+        self.card_grid.set_products(products, saved_amount)
+    
+    def save_snapshot(self, listing, count):
+        """Roda na thread do banco: grava a primeira tela para a próxima abertura"""
+        products = self.db.get_products_page(limit=count, **dict(listing, search=None))
+        thumbnails = {product['id']: self.db.get_thumbnail(product['id'])
+                      for product in products if product['has_image']}
+        write_snapshot(self.config.get_snapshot_path(), self.db.db_path, listing,
+                       self.db.get_goal_stats(), products, thumbnails)
+    
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        # A moldura aparece primeiro; os produtos são pedidos logo depois
+        if not self.started:
+            self.started = True
+            self.first_painted.emit()
+            QTimer.singleShot(0, self.start)
+    
+    def start(self):
+        # A fila do banco é única: a listagem só roda depois de ele abrir
+        self.db_worker.submit(self.open_database, on_done=self.show_database_opened,
+                              on_error=self.show_open_error)
         self.load_products()
     
+    def open_database(self):
+        """Roda na thread do banco: conexão e migrações pendentes"""
+        try:
+            self.db.open()
+        finally:
+            # Quem lê miniaturas no pool de imagens espera por isto
+            self.db_ready.set()
+    
+    def fetch_card_thumbnail(self, product_id):
+        """Roda no pool de imagens; cards do retrato podem pedir antes de o banco abrir"""
+        self.db_ready.wait()
+        return self.db.get_thumbnail(product_id, size_name='card')
+    
+    def show_database_opened(self, result=None):
+        self.database_opened.emit()
+        
+        # Bancos antigos: gerar as miniaturas que faltam (e converter as que
+        # estão em outro formato) sem travar a interface
+        self.start_thumbnail_job()
+        self.maintenance_timer.start()
+    
+    def show_open_error(self, error):
+        print(f"Erro ao abrir banco de dados: {error}")
+        QMessageBox.critical(self, "Erro", f"Erro ao abrir banco de dados:\n{error}")
+        self.close()
+        QApplication.exit(1)
+    
     def setup_ui(self):
         # Widget central
         central_widget = QWidget()
@@ -58,21 +175,61 @@ class MainWindow(QMainWindow):
         header_layout = QHBoxLayout(header)
         header_layout.setContentsMargins(30, 0, 30, 0)
         
-        # Valor guardado (esquerda)
+        # Valor guardado e estatísticas da meta (esquerda)
         saved_layout = QHBoxLayout()
         self.saved_label = QLabel("Valor Guardado: R$ 0,00")
         self.saved_label.setObjectName("savedAmount")
         
+        self.stats_label = QLabel()
+        self.stats_label.setObjectName("goalStats")
+        
+        amounts_layout = QVBoxLayout()
+        amounts_layout.setSpacing(2)
+        amounts_layout.addStretch()
+        amounts_layout.addWidget(self.saved_label)
+        amounts_layout.addWidget(self.stats_label)
+        amounts_layout.addStretch()
+        
         edit_saved_btn = QPushButton("Editar")
         edit_saved_btn.setObjectName("editSavedBtn")
         edit_saved_btn.clicked.connect(self.edit_saved_amount)
         
-        saved_layout.addWidget(self.saved_label)
+        saved_layout.addLayout(amounts_layout)
         saved_layout.addWidget(edit_saved_btn)
         
         header_layout.addLayout(saved_layout)
         header_layout.addStretch()
         
+        # Aviso de espera pelo banco (rede lenta, arquivo travado pela sincronização)
+        self.pending_label = QLabel()
+        self.pending_label.setObjectName("pendingState")
+        self.pending_label.setVisible(False)
+        header_layout.addWidget(self.pending_label)
+        header_layout.addSpacing(10)
+        
+        self.pending_timer = QTimer(self)
+        self.pending_timer.setSingleShot(True)
+        self.pending_timer.setInterval(self.PENDING_DELAY_MS)
+        self.pending_timer.timeout.connect(self.show_pending_state)
+        self.db_worker.pending_changed.connect(self.update_pending_state)
+        self.db_worker.retrying.connect(self.show_retry_state)
+        
+        # Busca por nome ou link, filtrando enquanto digita
+        self.search_input = QLineEdit()
+        self.search_input.setObjectName("searchBox")
+        self.search_input.setPlaceholderText("Buscar produtos...")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setFixedWidth(260)
+        
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self.apply_search)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        
+        header_layout.addWidget(self.search_input)
+        header_layout.addSpacing(10)
+        
         # Botões direita
         buttons_layout = QHBoxLayout()
         buttons_layout.setSpacing(10)
@@ -92,103 +249,431 @@ class MainWindow(QMainWindow):
         header_layout.addLayout(buttons_layout)
         
         main_layout.addWidget(header)
+        main_layout.addWidget(self.create_filter_bar())
+        
+        # Grade virtualizada: só os cards visíveis são criados
+        self.card_grid = CardGrid(self.create_card)
+        self.card_grid.more_needed.connect(self.load_more_products, Qt.ConnectionType.QueuedConnection)
+        self.card_grid.selection_changed.connect(self.update_selection_bar)
+        
+        main_layout.addWidget(self.create_selection_bar())
+        
+        # Mensagem exibida quando não há produtos
+        self.no_products_label = QLabel(self.NO_PRODUCTS_TEXT)
+        self.no_products_label.setObjectName("noProducts")
+        self.no_products_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.no_products_label.setVisible(False)
+        main_layout.addWidget(self.no_products_label)
+        main_layout.addWidget(self.card_grid)
+    
+    def create_filter_bar(self):
+        """Barra de ordenação e filtros, restaurados da configuração"""
+        filter_bar = QFrame()
+        filter_bar.setObjectName("filterBar")
         
-        # Área de scroll para os cards
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        layout = QHBoxLayout(filter_bar)
+        layout.setContentsMargins(30, 8, 30, 8)
+        layout.setSpacing(10)
         
-        # Container dos cards
-        self.cards_container = QWidget()
-        self.cards_container.setObjectName("cardsContainer")
-        self.cards_layout = QVBoxLayout(self.cards_container)
-        self.cards_layout.setContentsMargins(0, 0, 0, 0)
-        self.cards_layout.setSpacing(0)
+        self.sort_combo = QComboBox()
+        self.sort_combo.setObjectName("sortBox")
+        for label, mode in self.SORT_OPTIONS:
+            self.sort_combo.addItem(label, mode)
+        index = self.sort_combo.findData(self.config.get_sort_mode())
+        self.sort_combo.setCurrentIndex(max(0, index))
+        self.sort_combo.currentIndexChanged.connect(self.change_view)
         
-        # Flow container
-        self.flow_container = QWidget()
-        self.flow_container.setObjectName("flowContainer")
-        self.flow_layout = FlowLayout(self.flow_container)
+        self.affordable_check = QCheckBox("Posso comprar agora")
+        self.affordable_check.setChecked(self.config.get_affordable_only())
+        self.affordable_check.toggled.connect(self.change_view)
         
-        self.cards_layout.addWidget(self.flow_container)
-        self.cards_layout.addStretch()
+        # Faixa de valor: 0 significa sem limite naquele lado
+        low, high = self.config.get_price_range()
+        self.price_min_input = QDoubleSpinBox()
+        self.price_min_input.setSpecialValueText("Sem mínimo")
+        self.price_max_input = QDoubleSpinBox()
+        self.price_max_input.setSpecialValueText("Sem máximo")
+        for spin, value in ((self.price_min_input, low), (self.price_max_input, high)):
+            spin.setMaximum(999999.99)
+            spin.setDecimals(2)
+            spin.setPrefix("R$ ")
+            spin.setFixedWidth(140)
+            spin.setValue(value or 0)
         
-        scroll_area.setWidget(self.cards_container)
-        main_layout.addWidget(scroll_area)
+        self.price_timer = QTimer(self)
+        self.price_timer.setSingleShot(True)
+        self.price_timer.setInterval(self.PRICE_FILTER_DELAY_MS)
+        self.price_timer.timeout.connect(self.change_view)
+        self.price_min_input.valueChanged.connect(self.price_timer.start)
+        self.price_max_input.valueChanged.connect(self.price_timer.start)
+        
+        layout.addWidget(QLabel("Ordenar por:"))
+        layout.addWidget(self.sort_combo)
+        layout.addSpacing(20)
+        layout.addWidget(self.affordable_check)
+        layout.addStretch()
+        layout.addWidget(QLabel("Valor de"))
+        layout.addWidget(self.price_min_input)
+        layout.addWidget(QLabel("até"))
+        layout.addWidget(self.price_max_input)
+        return filter_bar
+    
+    def create_selection_bar(self):
+        """Ações em massa, visíveis enquanto houver produtos selecionados"""
+        self.selection_bar = QFrame()
+        self.selection_bar.setObjectName("selectionBar")
+        self.selection_bar.setVisible(False)
+        
+        layout = QHBoxLayout(self.selection_bar)
+        layout.setContentsMargins(30, 8, 30, 8)
+        layout.setSpacing(10)
+        
+        self.selection_label = QLabel()
+        self.selection_label.setObjectName("selectionCount")
+        layout.addWidget(self.selection_label)
+        layout.addStretch()
+        
+        actions = (
+            ("Marcar como comprados", partial(self.set_selected_purchased, True)),
+            ("Desmarcar compra", partial(self.set_selected_purchased, False)),
+            ("Alterar valor...", self.reprice_selected),
+            ("Remover", self.remove_selected),
+            ("Limpar seleção", self.card_grid.clear_selection),
+        )
+        for text, slot in actions:
+            button = QPushButton(text)
+            button.clicked.connect(slot)
+            layout.addWidget(button)
+        return self.selection_bar
+    
+    def update_selection_bar(self):
+        count = len(self.card_grid.selected)
+        plural = "produto selecionado" if count == 1 else "produtos selecionados"
+        self.selection_label.setText(f"{count} {plural}")
+        self.selection_bar.setVisible(count > 0)
+    
+    def set_selected_purchased(self, purchased):
+        # Uma transação para todos e uma única atualização da grade
+        self.write_db(self.db.set_purchased_many, list(self.card_grid.selected), purchased)
+    
+    def reprice_selected(self):
+        product_ids = list(self.card_grid.selected)
+        dialog = RepriceDialog(len(product_ids), self)
+        if dialog.exec() and dialog.get_percent():
+            self.write_db(self.db.reprice_products, product_ids, dialog.get_percent())
+    
+    def remove_selected(self):
+        product_ids = list(self.card_grid.selected)
+        reply = QMessageBox.question(
+            self, "Confirmar Remoção",
+            f"Tem certeza que deseja remover {len(product_ids)} produto(s)?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
         
-        # Atualizar valor guardado
-        self.update_saved_label()
+        if reply == QMessageBox.StandardButton.Yes:
+            self.run_db(self.delete_and_read_totals, product_ids,
+                        on_done=partial(self.after_products_removed, product_ids))
+    
+    def delete_and_read_totals(self, product_ids):
+        """Roda na thread do banco: remove os produtos e relê os totais"""
+        self.db.delete_products(product_ids)
+        return self.db.get_goal_stats()
+    
+    def after_products_removed(self, product_ids, stats):
+        # A ordem dos demais não muda: basta tirá-los da grade
+        for product_id in product_ids:
+            self.products_by_id.pop(product_id, None)
+        self.card_grid.remove_products(product_ids)
+        self.show_goal_stats(stats)
+        if not self.card_grid.products:
+            self.load_products()
     
-    def update_saved_label(self):
-        amount = self.db.get_saved_amount()
+    def price_range(self):
+        return (self.price_min_input.value() or None,
+                self.price_max_input.value() or None)
+    
+    def change_view(self):
+        # Ordenação e filtros persistem entre sessões
+        self.config.set_sort_mode(self.sort_combo.currentData())
+        self.config.set_affordable_only(self.affordable_check.isChecked())
+        self.config.set_price_range(*self.price_range())
+        self.apply_search()
+    
+    def show_goal_stats(self, stats):
+        """Atualiza o header com os totais em cache no banco"""
+        self.goal_stats = stats
+        amount = stats['saved_amount']
         self.saved_label.setText(f"Valor Guardado: R$ {amount:,.2f}")
+        
+        months = stats['months_to_goal']
+        if months is None:
+            forecast = "defina quanto guarda por mês"
+        elif months == 0:
+            forecast = "meta atingida"
+        else:
+            forecast = f"~{months} {'mês' if months == 1 else 'meses'} para a meta"
+        
+        self.stats_label.setText(
+            f"Pendentes: R$ {stats['pending_total']:,.2f} · "
+            f"Faltam: R$ {stats['remaining']:,.2f} · "
+            f"{stats['affordable_count']} de {stats['pending_count']} ao alcance · "
+            f"{forecast}"
+        )
         return amount
     
-    def load_products(self):
-        # Limpar cards existentes
-        self.flow_layout.clear_layout()
+    def run_db(self, function, *args, on_done=None, **kwargs):
+        """Roda uma chamada ao banco na thread do banco, sem travar a janela"""
+        return self.db_worker.submit(function, *args, on_done=on_done,
+                                     on_error=self.show_db_error, **kwargs)
+    
+    def write_db(self, function, *args, **kwargs):
+        """Grava pela thread do banco e recarrega a listagem em seguida"""
+        return self.run_db(function, *args, on_done=self.after_write, **kwargs)
+    
+    def after_write(self, result=None):
+        self.load_products()
+    
+    def show_db_error(self, error):
+        print(f"Erro no banco de dados: {error}")
+        QMessageBox.warning(self, "Banco de Dados",
+                            f"Não foi possível acessar o banco de dados:\n{error}")
+    
+    def update_pending_state(self, count):
+        # Só aparece se a espera passar do atraso, para não piscar a cada clique
+        if count:
+            if not self.pending_timer.isActive() and not self.pending_label.isVisible():
+                self.pending_timer.start()
+        else:
+            self.pending_timer.stop()
+            self.pending_label.setVisible(False)
+    
+    def show_pending_state(self):
+        self.pending_label.setText("Sincronizando com o banco...")
+        self.pending_label.setVisible(True)
+    
+    def show_retry_state(self, attempt, delay):
+        self.pending_timer.stop()
+        self.pending_label.setText(f"Banco ocupado, tentando de novo em {delay:.1f} s...")
+        self.pending_label.setVisible(True)
+    
+    def show_notice(self, text):
+        """Aviso passageiro no lugar do estado do banco"""
+        self.pending_label.setText(text)
+        self.pending_label.setVisible(True)
+        QTimer.singleShot(self.NOTICE_MS, partial(self.hide_notice, text))
+    
+    def hide_notice(self, text):
+        # Se o estado do banco tomou o lugar do aviso, ele fica
+        if self.pending_label.text() == text:
+            self.pending_label.setVisible(False)
+    
+    def apply_search(self):
+        # Resultados novos começam do topo, lendo só a primeira página
+        self.card_grid.verticalScrollBar().setValue(0)
+        self.load_products(reset=True)
+    
+    def load_products(self, reset=False):
+        """Pede a listagem ao banco; a grade é atualizada quando ela chegar.
+        
+        Só a primeira página é lida de imediato (ou as que já estavam
+        carregadas, ao atualizar); as demais chegam conforme a rolagem.
+        """
+        self.listing = self.current_listing()
+        wanted = self.PAGE_SIZE if reset else max(self.PAGE_SIZE, len(self.card_grid.products))
+        
+        # Respostas de consultas antigas (busca digitada no meio) são descartadas
+        self.listing_generation += 1
+        self.run_db(self.fetch_listing, dict(self.listing), wanted,
+                    on_done=partial(self.show_listing, self.listing_generation))
+    
+    def current_listing(self):
+        """Filtros da listagem como estão na interface"""
+        return {
+            'show_purchased': self.config.get_show_purchased(),
+            'search': self.search_input.text().strip(),
+            'sort': self.sort_combo.currentData(),
+            'price_range': self.price_range(),
+            'affordable': self.affordable_check.isChecked(),
+        }
+    
+    def fetch_listing(self, listing, wanted):
+        """Roda na thread do banco: páginas até `wanted` itens e os totais"""
+        products = []
+        has_more = False
+        for page in self.db.iter_products(page_size=self.PAGE_SIZE, **listing):
+            products.extend(page)
+            if len(products) >= wanted:
+                has_more = len(page) == self.PAGE_SIZE
+                break
+        return products, has_more, self.db.get_goal_stats()
+    
+    def show_listing(self, generation, result):
+        if generation != self.listing_generation:
+            return
+        
+        products, has_more, stats = result
+        first_listing = not self.listing_loaded
+        self.listing_loaded = True
+        saved_amount = self.show_goal_stats(stats)
         
-        # Carregar produtos
-        show_purchased = self.config.get_show_purchased()
-        products = self.db.get_all_products(show_purchased)
-        saved_amount = self.update_saved_label()
+        listing = self.listing
+        filtered = listing['search'] or listing['affordable'] or listing['price_range'] != (None, None)
+        self.no_products_label.setText(self.NO_RESULTS_TEXT if filtered else self.NO_PRODUCTS_TEXT)
+        self.no_products_label.setVisible(not products)
+        self.card_grid.setVisible(bool(products))
+        self.products_by_id = {product['id']: product for product in products}
+        self.card_grid.set_products(products, saved_amount, has_more)
         
-        if not products:
-            no_products = QLabel("Nenhum produto adicionado ainda.\nClique em 'Adicionar' para começar!")
-            no_products.setObjectName("noProducts")
-            no_products.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.cards_layout.insertWidget(0, no_products)
+        if first_listing:
+            self.first_listing_shown.emit()
+    
+    def load_more_products(self):
+        if not self.card_grid.products:
             return
+        # Keyset: a próxima página começa depois do último produto carregado
+        self.run_db(self.db.get_products_page, after=self.card_grid.products[-1],
+                    limit=self.PAGE_SIZE, **self.listing,
+                    on_done=partial(self.show_more_products, self.listing_generation))
+    
+    def show_more_products(self, generation, page):
+        if generation != self.listing_generation:
+            return
+        self.products_by_id.update((product['id'], product) for product in page)
+        self.card_grid.append_products(page, len(page) == self.PAGE_SIZE)
+    
+    def start_thumbnail_job(self):
+        if self.thumbnail_job_running:
+            return  # a tarefa em andamento relê o formato a cada lote
+        self.thumbnail_job_running = True
+        self.image_loader.run_task(self.update_thumbnails)
+    
+    def update_thumbnails(self):
+        """Roda no pool de imagens: gera as miniaturas que faltam e converte
+        as que estão num formato diferente do escolhido"""
+        should_continue = lambda: not self.image_loader.stopping
+        stats = None
+        try:
+            self.db.backfill_thumbnails(should_continue=should_continue)
+            stats = self.db.reencode_thumbnails(should_continue=should_continue)
+        except sqlite3.Error as e:
+            # Banco ocupado, por exemplo: a conversão continua na próxima abertura
+            print(f"Erro ao atualizar miniaturas: {e}")
+        finally:
+            self.thumbnail_job_running = False
         
-        # Criar cards
-        for product in products:
-            card = ProductCard(product, saved_amount)
-            card.edit_clicked.connect(self.edit_product)
-            card.remove_clicked.connect(self.remove_product)
-            card.purchase_clicked.connect(self.toggle_purchase)
-            card.link_clicked.connect(self.open_link)
-            
-            self.flow_layout.addWidget(card)
+        if stats and stats['images'] and should_continue():
+            self.thumbnails_reencoded.emit(stats)
+    
+    def show_reencode_report(self, stats):
+        saved = stats['bytes_before'] - stats['bytes_after']
+        self.show_notice(f"{stats['images']} miniaturas convertidas, "
+                         f"{format_size(max(saved, 0))} a menos no banco")
+    
+    def postpone_maintenance(self, count):
+        # Cada pedido ao banco recomeça a contagem do tempo ocioso
+        if self.started and not self.maintenance_checked:
+            self.maintenance_timer.start()
+    
+    def start_idle_maintenance(self):
+        self.maintenance_checked = True
+        self.run_db(self.idle_maintenance, on_done=self.show_maintenance_report)
+    
+    def idle_maintenance(self):
+        """Roda na thread do banco; None se a manutenção não estiver no prazo"""
+        if not is_maintenance_due(self.db):
+            return None
+        # Um pedido da interface interrompe a compactação, que continua na próxima vez
+        return run_maintenance(self.db, should_continue=lambda: not self.db_worker.has_waiting_requests())
+    
+    def run_full_maintenance(self, on_done, on_error):
+        """Manutenção pedida nas configurações; on_done recebe o relatório e
+        on_error é chamado, depois do aviso de erro, se ela falhar"""
+        def show_error(error):
+            self.show_db_error(error)
+            on_error(error)
+        
+        self.db_worker.submit(run_maintenance, self.db, full=True,
+                              on_done=on_done, on_error=show_error)
+    
+    def show_maintenance_report(self, report):
+        if report is None:
+            return
+        if report['problems']:
+            self.show_notice("A verificação encontrou problemas no banco; guarde uma cópia do arquivo.")
+            return
+        
+        freed = total_bytes(report['before']) - total_bytes(report['after'])
+        if freed > 0:
+            self.show_notice(f"Banco compactado: {format_size(freed)} liberados")
+    
+    def thumbnail_codecs(self):
+        """Formatos de miniatura que o Pillow grava e o Qt desta máquina exibe"""
+        readable = {bytes(name).decode('ascii') for name in QImageReader.supportedImageFormats()}
+        return [codec for codec in available_codecs() if codec in readable]
+    
+    def create_card(self, product, saved_amount):
+        card = ProductCard(product, saved_amount, self.image_loader)
+        card.edit_clicked.connect(self.edit_product)
+        card.remove_clicked.connect(self.remove_product)
+        card.purchase_clicked.connect(self.toggle_purchase)
+        card.link_clicked.connect(self.open_link)
+        return card
     
     def add_product(self):
         dialog = AddProductDialog(self)
         if dialog.exec():
             data = dialog.get_data()
-            self.db.add_product(
+            self.write_db(
+                self.db.add_product,
                 data['name'],
                 data['price'],
                 data['link'],
                 data['image_path']
             )
-            self.load_products()
     
     def edit_product(self, product_id):
-        # Buscar produto
-        products = self.db.get_all_products(True)
-        product = next((p for p in products if p['id'] == product_id), None)
-        
-        if product:
-            dialog = EditProductDialog(product, self)
-            if dialog.exec():
-                data = dialog.get_data()
-                
-                if data['keep_current_image']:
-                    self.db.update_product(
-                        product_id,
-                        data['name'],
-                        data['price'],
-                        data['link']
-                    )
-                else:
-                    self.db.update_product(
-                        product_id,
-                        data['name'],
-                        data['price'],
-                        data['link'],
-                        data['image_path']
-                    )
-                
-                self.load_products()
+        # O card só existe para produtos carregados; a busca no banco é o caso raro
+        product = self.products_by_id.get(product_id)
+        if product is None:
+            self.run_db(self.db.get_product, product_id,
+                        on_done=partial(self.open_edit_dialog, product_id))
+        else:
+            self.open_edit_dialog(product_id, product)
+    
+    def open_edit_dialog(self, product_id, product):
+        if not product:
+            return
+        
+        image_hash = product['image_hash']
+        if image_hash and pixmap_cache.get(product_id, image_hash, EditProductDialog.PREVIEW_SIZE) is None:
+            # Miniatura fora do cache: lida (ou gerada, se faltar) na thread do banco
+            self.run_db(self.db.get_thumbnail, product_id, size_name='dialog',
+                        on_done=partial(self.show_edit_dialog, product_id, product))
+        else:
+            self.show_edit_dialog(product_id, product, None)
+    
+    def show_edit_dialog(self, product_id, product, preview_data):
+        dialog = EditProductDialog(product, preview_data, self)
+        if dialog.exec():
+            data = dialog.get_data()
+            
+            if data['keep_current_image']:
+                self.write_db(
+                    self.db.update_product,
+                    product_id,
+                    data['name'],
+                    data['price'],
+                    data['link']
+                )
+            else:
+                self.write_db(
+                    self.db.update_product,
+                    product_id,
+                    data['name'],
+                    data['price'],
+                    data['link'],
+                    data['image_path']
+                )
     
     def remove_product(self, product_id):
         reply = QMessageBox.question(
@@ -198,27 +683,70 @@ class MainWindow(QMainWindow):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            self.db.delete_product(product_id)
-            self.load_products()
+            self.write_db(self.db.delete_product, product_id)
     
     def toggle_purchase(self, product_id):
-        self.db.toggle_purchased(product_id)
-        self.load_products()
+        self.write_db(self.db.toggle_purchased, product_id)
     
     def open_link(self, link):
         if link:
             QDesktopServices.openUrl(QUrl(link))
     
     def edit_saved_amount(self):
-        current = self.db.get_saved_amount()
-        dialog = EditSavedAmountDialog(current, self)
+        stats = self.goal_stats
+        if stats is None:
+            return  # a primeira listagem ainda não chegou
+        dialog = EditSavedAmountDialog(stats['saved_amount'], stats['monthly_savings'], self)
         
         if dialog.exec():
             new_amount = dialog.get_amount()
-            self.db.update_saved_amount(new_amount)
+            self.run_db(self.store_savings, new_amount, dialog.get_monthly_savings(),
+                        on_done=self.after_savings_changed)
+            
+            # Só o progresso dos cards muda; não há o que reconstruir
+            self.card_grid.set_saved_amount(new_amount)
+    
+    def store_savings(self, amount, monthly_savings):
+        """Roda na thread do banco: grava os dois valores e relê os totais"""
+        with self.db.batch():
+            self.db.update_saved_amount(amount)
+            self.db.update_monthly_savings(monthly_savings)
+        return self.db.get_goal_stats()
+    
+    def after_savings_changed(self, stats):
+        if self.listing['affordable']:
+            # O que cabe no valor guardado mudou: refazer a consulta
             self.load_products()
+        else:
+            self.show_goal_stats(stats)
     
     def open_settings(self):
-        dialog = SettingsDialog(self.config, self)
+        # O formato das miniaturas fica no banco, junto com o espaço que ocupam
+        self.run_db(self.read_settings_state, on_done=self.show_settings)
+    
+    def read_settings_state(self):
+        """Roda na thread do banco"""
+        return self.db.get_thumbnail_encoding(), self.db.get_thumbnail_stats(), database_size(self.db)
+    
+    def show_settings(self, settings_state):
+        encoding, stats, size = settings_state
+        dialog = SettingsDialog(self.config, encoding, self.thumbnail_codecs(), stats,
+                                size, self.run_full_maintenance, self)
         if dialog.exec():
+            new_encoding = dialog.get_thumbnail_encoding()
+            if new_encoding != encoding:
+                self.run_db(self.db.update_thumbnail_encoding, new_encoding,
+                            on_done=lambda _: self.start_thumbnail_job())
             self.load_products()
+    
+    def closeEvent(self, event):
+        # Nenhuma decodificação pode continuar usando o banco depois de fechado,
+        # e as escritas já enfileiradas (e o retrato da primeira tela) precisam terminar
+        self.image_loader.shutdown()
+        self.config.set_window_geometry(bytes(self.saveGeometry().toBase64()).decode('ascii'))
+        if self.listing_loaded:
+            # Sem a listagem real (banco ainda abrindo, ou com erro), o retrato anterior fica
+            self.db_worker.submit(self.save_snapshot, self.current_listing(),
+                                  self.card_grid.first_screen_count())
+        self.db_worker.shutdown()
+        super().closeEvent(event)
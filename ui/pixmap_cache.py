@@ -0,0 +1,87 @@
+from collections import OrderedDict
+
+
+class PixmapCache:
+    """Cache LRU de pixmaps decodificados, compartilhado pelo programa todo.
+
+    A chave é (id do produto, hash da imagem, tamanho), então uma imagem nova
+    nunca reaproveita o pixmap antigo. O limite é em bytes: ao passar do
+    orçamento, os pixmaps usados há mais tempo são descartados.
+    """
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()   # chave -> (pixmap, bytes)
+        self.keys_by_product = {}      # id do produto -> chaves no cache
+        self.total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(product_id, image_hash, size):
+        return (product_id, image_hash, size.width(), size.height())
+
+    def get(self, product_id, image_hash, size):
+        key = self.make_key(product_id, image_hash, size)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, product_id, image_hash, size, pixmap):
+        key = self.make_key(product_id, image_hash, size)
+        if key in self.entries:
+            self._remove(key)
+
+        cost = pixmap.width() * pixmap.height() * max(1, pixmap.depth() // 8)
+        if cost > self.max_bytes:
+            return
+
+        self.entries[key] = (pixmap, cost)
+        self.keys_by_product.setdefault(product_id, set()).add(key)
+        self.total_bytes += cost
+
+        while self.total_bytes > self.max_bytes:
+            oldest = next(iter(self.entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, product_id):
+        """Descarta todos os tamanhos em cache da imagem de um produto"""
+        for key in list(self.keys_by_product.get(product_id, ())):
+            self._remove(key)
+
+    def clear(self):
+        self.entries.clear()
+        self.keys_by_product.clear()
+        self.total_bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+            'bytes': self.total_bytes,
+        }
+
+    def _remove(self, key):
+        _, cost = self.entries.pop(key)
+        self.total_bytes -= cost
+
+        keys = self.keys_by_product.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.keys_by_product[key[0]]
+
+
+# Instância única usada pelos cards e diálogos
+pixmap_cache = PixmapCache()